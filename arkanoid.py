@@ -1,4 +1,6 @@
 import sys
+import time
+import getpass
 import os.path
 
 from PyQt5.QtCore import QUrl
@@ -9,26 +11,38 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
     QStackedLayout,
     QWidget,
-    QDesktopWidget,
     QMessageBox,
     QGroupBox,
-    QSlider)
-from PyQt5.QtGui import QPainter, QImage, QBrush, QPalette, QFont, QColor
-from PyQt5.QtCore import Qt, QRectF, QTimer
+    QSlider,
+    QListWidget,
+    QListWidgetItem)
+from PyQt5.QtGui import QPainter, QImage, QBrush, QPalette, QIcon
+from PyQt5.QtCore import Qt, QRectF, QSize, QTimer
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaPlaylist
 from PyQt5.QtWidgets import QLabel
 from game import GameModel
-from core import Size, BallState
+from settings import Settings
+from simulation import Simulation
+from leaderboard import Leaderboard
+from level import LevelCreator
+from renderer import FrameRenderer
+from recording import new_run, save_run
+from thumbnails import ThumbnailCache
+
+
+RUN_FILENAME = 'last_run.json'
 
 
 class Window(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.screen = QDesktopWidget().screenGeometry()
-
         self.started = False
         self.paused = False
+        self.painted_tick = None
+        self.state_publisher = None
+        self.run = None
+        self.editor_mode = '--editor' in sys.argv
         self.left = False
         self.right = False
         self.timer = QTimer()
@@ -37,6 +51,7 @@ class Window(QWidget):
 
         self.main_menu = QWidget(self)
         self.settings = QWidget(self)
+        self.level_select = QWidget(self)
         self.game_widget = QWidget(self)
         self.game_widget.setMouseTracking(True)
         self.game_widget.mouseMoveEvent = self.mouse_move_event
@@ -55,44 +70,127 @@ class Window(QWidget):
         self.media_player.setMedia(QMediaContent(QUrl('space_music.mp3')))
         self.media_player.play()
 
-        self.game = GameModel(Size(self.screen.width(), self.screen.height()))
+        self.leaderboard = Leaderboard()
+        self.player_name = getpass.getuser()
+        self.level_set = os.path.basename(LevelCreator.path)
+
+        self.thumbnails = ThumbnailCache()
+        self.level_items = {}
+        self.thumbnail_timer = QTimer()
+        self.thumbnail_timer.timeout.connect(self.update_thumbnails)
+
+        self.playfield = Settings.playfield_size
+        self.game = GameModel(self.playfield)
+        self.simulation = Simulation(self.game)
+        self.snapshot = self.simulation.snapshots.read()
+
+        self.turbo_label = QLabel(self.game_widget)
+        self.turbo_label.setStyleSheet(
+            'QLabel {color: gold; font-size: 20px;}')
+        self.turbo_label.move(10, 40)
+        self.turbo_label.hide()
+        self.rate_ticks = 0
+        self.rate_time = time.perf_counter()
 
         self.painter = QPainter()
+        self.renderer = FrameRenderer(self.playfield, Settings.render_scale)
 
         self.stacked = QStackedLayout(self)
         self.stacked.addWidget(self.game_widget)
         self.stacked.addWidget(self.settings)
+        self.stacked.addWidget(self.level_select)
         self.set_main_menu_layout()
         self.set_settings_layout()
+        self.set_level_select_layout()
         self.stacked.setCurrentWidget(self.main_menu)
 
         self.showFullScreen()
 
-    def start(self):
+    def start(self, first_level=1):
         if not self.started:
-            self.game = GameModel(Size(self.width(), self.height()))
+            self.stop_simulation()
+            self.run = new_run(self.playfield,
+                               fixed_point='--fixed-point' in sys.argv,
+                               start=first_level - 1)
+            self.game = GameModel(self.playfield, seed=self.run.seed,
+                                  fixed_point=self.run.fixed_point,
+                                  telemetry=self.get_telemetry(),
+                                  start=self.run.start)
+            self.simulation = Simulation(self.game)
+            if '--record' in sys.argv:
+                self.simulation.journal = self.run.inputs
+            self.simulation.send('set_editor', self.editor_mode)
+            self.simulation.exporter = self.get_state_publisher()
+            if '--turbo-until' in sys.argv:
+                until = sys.argv[sys.argv.index('--turbo-until') + 1]
+                self.simulation.send('set_turbo', Settings.turbo_steps,
+                                     int(until))
+            self.rate_ticks = 0
+            self.simulation.start()
             self.started = True
         self.left = self.right = False
+        self.painted_tick = None
+        self.simulation.send('turn', 0)
+        self.simulation.resume()
         self.timer.start(12)
         self.change_current_widget(self.game_widget)
 
+    def submit_score(self):
+        self.leaderboard.submit(self.player_name, self.snapshot.score,
+                                self.level_set, self.snapshot.level)
+
+    def show_leaderboard(self):
+        runs = self.leaderboard.cached_top(self.level_set)
+        lines = ['%s. %s - %s (level %s)' % (place, run.player, run.score,
+                                             run.level)
+                 for place, run in enumerate(runs, 1)]
+        QMessageBox.information(self, 'Leaderboard',
+                                '\n'.join(lines) or 'No scores yet')
+
+    def stop_simulation(self):
+        self.simulation.stop()
+        if self.simulation.is_alive():
+            self.simulation.join()
+        if self.game.telemetry is not None:
+            self.game.telemetry.close()
+        if self.simulation.journal is not None:
+            save_run(RUN_FILENAME,
+                     self.run._replace(ticks=self.simulation.ticks))
+
+    def get_state_publisher(self):
+        if self.state_publisher is None and '--share-state' in sys.argv:
+            from sharedstate import StatePublisher
+            self.state_publisher = StatePublisher()
+        return self.state_publisher
+
+    @staticmethod
+    def get_telemetry():
+        if '--telemetry' in sys.argv:
+            from telemetry import Telemetry, session_path
+            return Telemetry(session_path())
+        return None
+
     def try_restart(self):
+        self.submit_score()
         reply = QMessageBox.question(
             self, 'Restart', 'Your score: %s. Do you want to restart?'
-            % self.game.player.score, QMessageBox.Yes | QMessageBox.No)
+            % self.snapshot.score, QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            self.start()
+            self.start(self.run.start + 1)
         else:
             self.go_to_main_menu()
 
     def notify_win(self):
+        self.submit_score()
         QMessageBox.information(self, 'Win', 'You win. Your score: %s'
-                                % self.game.player.score)
+                                % self.snapshot.score)
         self.started = False
         self.go_to_main_menu()
 
     def go_to_main_menu(self):
         self.timer.stop()
+        self.thumbnail_timer.stop()
+        self.simulation.pause()
         self.change_current_widget(self.main_menu)
 
     def quit(self):
@@ -101,17 +199,71 @@ class Window(QWidget):
             QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
+            self.stop_simulation()
+            self.leaderboard.close()
+            self.thumbnails.close()
+            if self.state_publisher:
+                self.state_publisher.close()
+            if '--gc-stats' in sys.argv:
+                print(self.simulation.gc_monitor.report())
             APP.quit()
 
     def tick(self):
-        if self.game.gameover:
+        simulation = self.simulation
+        handled = simulation.handled
+        idle = simulation.idle.is_set() and handled == simulation.sent
+        self.snapshot = simulation.snapshots.read()
+        if self.snapshot.gameover:
+            self.timer.stop()
             self.started = False
             self.try_restart()
-        if self.game.won:
+        elif self.snapshot.won:
+            self.timer.stop()
             self.notify_win()
+
+        if self.snapshot.tick != self.painted_tick:
+            self.painted_tick = self.snapshot.tick
+            self.repaint()
+        elif idle:
+            self.timer.stop()
+        self.update_turbo_label()
+
+    def update_turbo_label(self):
+        now = time.perf_counter()
+        if now - self.rate_time < 0.5:
+            return
+        simulation = self.simulation
+        rate = (simulation.ticks - self.rate_ticks) / (now - self.rate_time)
+        self.rate_ticks = simulation.ticks
+        self.rate_time = now
+        modes = []
+        if simulation.turbo > 1:
+            modes.append('Turbo x%s' % simulation.turbo)
+        if simulation.until is not None:
+            modes.append('skipping frames')
+        if simulation.autopilot:
+            modes.append('Autopilot')
+        self.turbo_label.setVisible(bool(modes))
+        self.turbo_label.setText('%s - %.0f ticks/s' % (', '.join(modes),
+                                                        rate))
+        self.turbo_label.adjustSize()
+
+    def toggle_turbo(self, until=None):
+        if self.simulation.turbo > 1 and until is None:
+            self.send('set_turbo', 1)
+        else:
+            self.send('set_turbo', Settings.turbo_steps, until)
+
+    def send(self, command, *args):
+        self.simulation.send(command, *args)
+        if self.started and not self.paused and \
+                not self.timer.isActive() and \
+                self.stacked.currentWidget() == self.game_widget:
+            self.timer.start(12)
+
+    def send_turn_rate(self):
         turn_rate = 1 if self.right else -1 if self.left else 0
-        self.game.tick(turn_rate)
-        self.repaint()
+        self.send('turn', turn_rate)
 
     def change_current_widget(self, widget):
         self.stacked.setCurrentWidget(widget)
@@ -121,6 +273,8 @@ class Window(QWidget):
         vbox = QVBoxLayout(self.main_menu)
 
         self.add_button('Start', self.start, vbox)
+        self.add_button('Select level', self.show_level_select, vbox)
+        self.add_button('Leaderboard', self.show_leaderboard, vbox)
         self.add_button('Settings', lambda: self.change_current_widget(
             self.settings), vbox)
         self.add_button('Quit', self.quit, vbox)
@@ -142,43 +296,128 @@ class Window(QWidget):
             lambda: self.change_ball_velocity(slider.value()))
         groupbox.layout().addWidget(label, alignment=Qt.AlignCenter)
         groupbox.layout().addWidget(slider, alignment=Qt.AlignCenter)
+
+        self.scale_slider = QSlider(Qt.Horizontal)
+        self.scale_slider.setRange(25, 100)
+        self.scale_slider.setTickPosition(QSlider.TicksLeft)
+        self.scale_slider.setValue(int(self.renderer.scale * 100))
+        scale_label = QLabel('Render quality')
+        scale_label.setStyleSheet('QLabel {color: gold;}')
+        self.scale_slider.valueChanged.connect(
+            lambda: self.change_render_scale(self.scale_slider.value() / 100))
+        groupbox.layout().addWidget(scale_label, alignment=Qt.AlignCenter)
+        groupbox.layout().addWidget(self.scale_slider,
+                                    alignment=Qt.AlignCenter)
         vbox.addWidget(groupbox)
         vbox.setAlignment(Qt.AlignCenter)
 
+    def set_level_select_layout(self):
+        vbox = QVBoxLayout(self.level_select)
+        self.level_list = QListWidget(self.level_select)
+        self.level_list.setViewMode(QListWidget.IconMode)
+        self.level_list.setIconSize(QSize(*self.thumbnails.size))
+        self.level_list.setResizeMode(QListWidget.Adjust)
+        self.level_list.setMovement(QListWidget.Static)
+        self.level_list.setSpacing(10)
+        self.level_list.setStyleSheet(
+            'QListWidget {background: transparent; color: gold;'
+            'font-size: 16px;}')
+        self.level_list.itemActivated.connect(
+            lambda item: self.select_level(self.level_list.row(item) + 1))
+        vbox.addWidget(self.level_list)
+        self.add_button('Back', self.go_to_main_menu, vbox)
+
+    def show_level_select(self):
+        self.level_list.clear()
+        self.level_items = {}
+        files = LevelCreator.get_level_files()
+        for filename, thumbnail in self.thumbnails.request(files):
+            item = QListWidgetItem(
+                os.path.splitext(os.path.basename(filename))[0])
+            if thumbnail:
+                item.setIcon(QIcon(thumbnail))
+            else:
+                self.level_items[filename] = item
+            self.level_list.addItem(item)
+        if self.level_items:
+            self.thumbnail_timer.start(100)
+        self.change_current_widget(self.level_select)
+        self.level_list.setFocus()
+
+    def update_thumbnails(self):
+        for filename, thumbnail in self.thumbnails.poll():
+            item = self.level_items.pop(filename, None)
+            if item is not None and thumbnail:
+                item.setIcon(QIcon(thumbnail))
+        if not self.level_items:
+            self.thumbnail_timer.stop()
+
+    def select_level(self, number):
+        self.thumbnail_timer.stop()
+        self.started = False
+        self.start(number)
+
     def change_ball_velocity(self, value):
-        self.game.settings.ball_velocity = value
-        for ball in self.game.balls:
-            ball.velocity = value
+        self.send('set_ball_velocity', value)
+
+    def change_render_scale(self, value):
+        self.renderer.scale = min(max(value, 0.25), 1.0)
+        self.scale_slider.setValue(int(round(self.renderer.scale * 100)))
+        self.update()
+
+    def viewport(self):
+        scale = min(self.width() / self.playfield.width,
+                    self.height() / self.playfield.height)
+        width = self.playfield.width * scale
+        height = self.playfield.height * scale
+        return QRectF((self.width() - width) / 2,
+                      (self.height() - height) / 2, width, height)
 
     def mouse_move_event(self, event):
-        current_mouse_x = event.x()
-        old_x = self.game.ship.x
-        self.game.ship.location = (current_mouse_x, self.game.ship.y)
-        delta_x = self.game.ship.x - old_x
-        for ball in self.game.balls:
-            if ball.state == BallState.Caught:
-                ball.move(delta_x)
+        viewport = self.viewport()
+        x = (event.x() - viewport.left()) * \
+            self.playfield.width / viewport.width()
+        self.send('move_ship_to', x)
 
     def mousePressEvent(self, event):
-        if not self.game.release_ball():
-            self.game.shooting()
+        self.send('release_ball_or_shoot')
 
     def keyPressEvent(self, event):
         key = event.key()
         self.left = key == Qt.Key_Left
         self.right = key == Qt.Key_Right
+        self.send_turn_rate()
         if key == Qt.Key_Escape:
             self.timer.stop()
             self.go_to_main_menu()
         if key == Qt.Key_Space:
-            self.game.release_ball()
+            self.send('release_ball')
         if key == Qt.Key_X:
-            self.game.shooting()
+            self.send('shooting')
+        if key == Qt.Key_E:
+            self.editor_mode = not self.editor_mode
+            self.send('set_editor', self.editor_mode)
+        if self.editor_mode and Qt.Key_1 <= key <= Qt.Key_9:
+            self.send('jump_to_level', key - Qt.Key_0)
+        if key == Qt.Key_Minus:
+            self.change_render_scale(self.renderer.scale - 0.25)
+        if key in (Qt.Key_Plus, Qt.Key_Equal):
+            self.change_render_scale(self.renderer.scale + 0.25)
+        if key == Qt.Key_T:
+            self.toggle_turbo()
+        if key == Qt.Key_N:
+            self.toggle_turbo('level')
+        if key == Qt.Key_L:
+            self.toggle_turbo('life')
+        if key == Qt.Key_A:
+            self.send('set_autopilot', not self.simulation.autopilot)
         if key == Qt.Key_P:
             self.paused = not self.paused
             if self.paused:
                 self.timer.stop()
+                self.simulation.pause()
             else:
+                self.simulation.resume()
                 self.timer.start()
 
     def keyReleaseEvent(self, event):
@@ -187,6 +426,7 @@ class Window(QWidget):
             self.left = False
         elif key == Qt.Key_Right:
             self.right = False
+        self.send_turn_rate()
 
     def paintEvent(self, event):
         self.painter.begin(self)
@@ -198,34 +438,12 @@ class Window(QWidget):
             self.painter.drawImage((self.width() - self.logo.width()) / 2, 50,
                                    self.logo)
 
-        if self.stacked.currentWidget() != self.game_widget or self.game.won:
+        snapshot = self.snapshot
+        if self.stacked.currentWidget() != self.game_widget or snapshot.won:
             return
 
-        self.painter.setRenderHint(self.painter.Antialiasing)
-        self.painter.setFont(QFont('Times New Roman', 20))
-        self.painter.setPen(QColor('gold'))
-
-        self.painter.drawText(0, 20, 'Scores: %s'
-                              % str(self.game.player.score))
-
-        game = self.game
-        self.painter.drawLine(game.frame.left, game.deadly_height,
-                              game.frame.right, game.deadly_height)
-
-        life_img = QImage(os.path.join('images', 'lifebonus.png'))
-        draw_x = self.width() - life_img.width()
-        draw_y = 0
-        for _ in range(self.game.player.lives):
-            self.painter.drawImage(draw_x, draw_y, life_img)
-            draw_x -= life_img.width()
-
-        self.draw_game_elements()
-
-    def draw_game_elements(self):
-        for entity in self.game.get_entities():
-            self.painter.drawImage(
-                QRectF(*entity.location, entity.width, entity.height),
-                QImage(entity.get_image()))
+        self.painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.painter.drawImage(self.viewport(), self.renderer.render(snapshot))
 
     @staticmethod
     def add_button(text, callback, layout, alignment=Qt.AlignCenter):
@@ -0,0 +1,80 @@
+import math
+import random
+import sys
+import time
+from broadphase import SweepAndPrune
+from core import Vector
+from entities import Ball
+from settings import Settings
+
+
+def create_balls(count, rng):
+    settings = Settings()
+    width, height = Settings.playfield_size
+    balls = []
+    for _ in range(count):
+        ball = Ball(rng.uniform(0, width), rng.uniform(0, height), settings)
+        ball.direction = Vector.from_angle(rng.uniform(-math.pi, math.pi))
+        balls.append(ball)
+    return balls
+
+
+def sweep(balls, broadphase):
+    broadphase.update(balls)
+    for one, other in broadphase.pairs():
+        one.collide_with(other)
+
+
+def naive(balls, _):
+    for i, one in enumerate(balls):
+        for other in balls[i + 1:]:
+            if one.intersects_with(other):
+                one.collide_with(other)
+
+
+def run(count, collide, ticks):
+    balls = create_balls(count, random.Random(count))
+    broadphase = SweepAndPrune()
+    started = time.perf_counter()
+    for _ in range(ticks):
+        for ball in balls:
+            ball.move()
+        collide(balls, broadphase)
+    return (time.perf_counter() - started) / ticks
+
+
+def run_broadphase(count, ticks):
+    balls = create_balls(count, random.Random(count))
+    broadphase = SweepAndPrune()
+    elapsed = 0
+    contacts = 0
+    for _ in range(ticks):
+        for ball in balls:
+            ball.move()
+        started = time.perf_counter()
+        broadphase.update(balls)
+        pairs = list(broadphase.pairs())
+        elapsed += time.perf_counter() - started
+        contacts += len(pairs)
+        for one, other in pairs:
+            one.collide_with(other)
+    return elapsed / ticks, contacts / ticks
+
+
+def main(ticks=20):
+    print('Playfield %sx%s' % tuple(Settings.playfield_size))
+    print('%6s %9s %14s %12s %12s %12s' % (
+        'balls', 'contacts', 'broadphase ms', 'us/ball', 'tick ms',
+        'naive ms'))
+    for count in (10, 100, 250, 500, 1000, 2000):
+        broadphase_time, contacts = run_broadphase(count, ticks)
+        sweep_time = run(count, sweep, ticks)
+        naive_time = run(count, naive, ticks) if count <= 500 else None
+        print('%6s %9.0f %14.3f %12.2f %12.3f %12s' % (
+            count, contacts, broadphase_time * 1000,
+            broadphase_time / count * 1e6, sweep_time * 1000,
+            '%.3f' % (naive_time * 1000) if naive_time else '-'))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,48 @@
+import random
+import sys
+import time
+from colliders import LevelColliders
+from core import Size
+from entities import Ball
+from level import LevelCreator
+from settings import Settings
+
+
+def pairwise(blocks, balls):
+    hits = set()
+    for ball in balls:
+        hits.clear()
+        for block in blocks:
+            if block.intersects_with(ball):
+                hits.add(block)
+
+
+def merged(blocks, balls):
+    colliders = LevelColliders(blocks)
+    hits = set()
+    for ball in balls:
+        hits.clear()
+        colliders.collect(ball, hits)
+
+
+def main(count=20000):
+    size = Size(1000, 700)
+    rng = random.Random(0)
+    balls = [Ball(rng.uniform(0, 1000), rng.uniform(0, 450), Settings())
+             for _ in range(count)]
+    for filename in LevelCreator.get_level_files():
+        blocks = LevelCreator.parse_file(size, filename, Settings())
+        colliders = LevelColliders(blocks)
+        timings = []
+        for check in (pairwise, merged):
+            started = time.perf_counter()
+            check(blocks, balls)
+            timings.append((time.perf_counter() - started) / count * 1e6)
+        print('%-9s %3s blocks %2s walls %2s rows  pairwise %5.1f us  '
+              'merged %4.1f us' % (filename.split('levels')[-1][1:],
+                                   len(blocks), len(colliders.walls),
+                                   len(colliders.rows), *timings))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
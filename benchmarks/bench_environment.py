@@ -0,0 +1,27 @@
+import random
+import sys
+import time
+from environment import ArkanoidEnv
+
+
+def run(observation, steps, **kwargs):
+    env = ArkanoidEnv(observation=observation, seed=0, **kwargs)
+    actions = random.Random(0)
+    env.reset()
+    started = time.perf_counter()
+    for _ in range(steps):
+        _, _, done, _ = env.step(actions.randrange(env.action_count))
+        if done:
+            env.reset()
+    return steps / (time.perf_counter() - started)
+
+
+def main(steps=5000):
+    for observation in ('features', 'pixels'):
+        rate = run(observation, steps, frame_skip=4, frame_stack=4)
+        print('%-8s %10.0f steps/s %10.0f ticks/s' % (observation, rate,
+                                                     rate * 4))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,22 @@
+import sys
+import time
+from generator import LevelGenerator
+
+
+def main(size=1000, repeats=5):
+    generator = LevelGenerator(size, size, strong_ratio=0.3,
+                               unbreakable_ratio=0.1, symmetry='both',
+                               pockets=size, seed=0)
+    grid = generator.grid()
+    for name, make in (('grid', generator.grid),
+                       ('text', lambda: generator.text(grid))):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            make()
+        print('%s %sx%s: %.1f ms' % (
+            name, size, size,
+            (time.perf_counter() - started) / repeats * 1000))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
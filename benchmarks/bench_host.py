@@ -0,0 +1,72 @@
+import asyncio
+import os
+import sys
+from host import HostClient, Supervisor, AUTOPILOT, RELEASE
+
+
+UNGATED = 2.0
+
+
+async def drain(client):
+    try:
+        while await client.reader.read(1 << 16):
+            pass
+    except ConnectionError:
+        pass
+
+
+async def open_session(port, drains):
+    client = await HostClient.connect(port=port)
+    client.send(RELEASE)
+    client.send(AUTOPILOT, True)
+    drains.append(asyncio.create_task(drain(client)))
+    return client
+
+
+async def ramp(port, step, settle):
+    probe = await HostClient.connect(port=port)
+    clients, drains = [], []
+    best = None
+    overruns = (await probe.statistics()).overruns
+    try:
+        while True:
+            for _ in range(step):
+                clients.append(await open_session(port, drains))
+            await asyncio.sleep(settle)
+            statistics = await probe.statistics()
+            late = statistics.overruns - overruns
+            overruns = statistics.overruns
+            sessions = statistics.sessions - 1
+            print('%5s sessions  utilization %5.2f  late ticks %s' % (
+                sessions, statistics.utilization, late))
+            if statistics.utilization >= 1:
+                break
+            best = (sessions, statistics.utilization)
+    finally:
+        for task in drains:
+            task.cancel()
+        for client in clients + [probe]:
+            client.writer.close()
+    return best
+
+
+def main(step=25, settle=3.0):
+    if os.cpu_count() == 1:
+        print('Only one core: the load generator competes with the host, '
+              'so late ticks are expected')
+    supervisor = Supervisor(port=0, workers=1, saturation=UNGATED)
+    supervisor.start_worker()
+    try:
+        best = asyncio.run(ramp(supervisor.port, int(step), float(settle)))
+    finally:
+        supervisor.stop()
+    if best is None:
+        print('A single session already saturates the core')
+        return
+    sessions, utilization = best
+    print('Max sessions per core at a 12 ms tick: %s (about %.0f at full '
+          'load)' % (sessions, sessions / max(utilization, 1e-9)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,43 @@
+import sys
+import time
+from core import Size
+from game import GameModel
+from simulation import Simulation
+
+
+def cpu_usage(idle_sleep, scenario, seconds):
+    game = GameModel(Size(1000, 700))
+    scenario(game)
+    simulation = Simulation(game, idle_sleep=idle_sleep)
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    simulation.start()
+    time.sleep(seconds)
+    simulation.stop()
+    simulation.join()
+    cpu = time.process_time() - started_cpu
+    wall = time.perf_counter() - started_wall
+    return cpu / wall * 100, simulation.ticks
+
+
+def caught_ball(game):
+    pass
+
+
+def game_over(game):
+    for _ in range(game.player.lives):
+        game.kill_player()
+
+
+def main(seconds=2.0):
+    seconds = float(seconds)
+    for name, scenario in (('caught ball', caught_ball),
+                           ('game over', game_over)):
+        for idle_sleep in (False, True):
+            usage, ticks = cpu_usage(idle_sleep, scenario, seconds)
+            print('%-12s idle sleep %-5s CPU %5.1f%%  ticks %s' % (
+                name, idle_sleep, usage, ticks))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
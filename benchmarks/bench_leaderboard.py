@@ -0,0 +1,52 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from leaderboard import Leaderboard
+
+
+def main(runs=100000, queries=1000):
+    directory = tempfile.mkdtemp()
+    try:
+        leaderboard = Leaderboard(os.path.join(directory, 'leaderboard.db'))
+        rng = random.Random(0)
+        players = ['player%s' % i for i in range(1000)]
+        level_sets = ['levels', 'generated', 'custom']
+
+        started = time.perf_counter()
+        for _ in range(runs):
+            leaderboard.submit(rng.choice(players), rng.randrange(100000),
+                               rng.choice(level_sets), rng.randrange(1, 5))
+        submitted = time.perf_counter() - started
+        leaderboard.flush()
+        stored = time.perf_counter() - started
+        print('submit %s runs: %.1f us/run on caller, %.2f s until stored'
+              % (runs, submitted / runs * 1e6, stored))
+
+        started = time.perf_counter()
+        for _ in range(queries):
+            leaderboard.top(rng.choice(level_sets))
+        print('top-10 per level set: %.1f us/query'
+              % ((time.perf_counter() - started) / queries * 1e6))
+
+        started = time.perf_counter()
+        for _ in range(queries):
+            leaderboard.player_top(rng.choice(players))
+        print('top-10 per player: %.1f us/query'
+              % ((time.perf_counter() - started) / queries * 1e6))
+
+        started = time.perf_counter()
+        for _ in range(queries):
+            leaderboard.cached_top(rng.choice(level_sets))
+        print('cached top-10: %.1f us/read'
+              % ((time.perf_counter() - started) / queries * 1e6))
+        print('stored runs: %s' % leaderboard.count())
+        leaderboard.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
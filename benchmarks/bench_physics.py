@@ -0,0 +1,29 @@
+import sys
+import time
+from core import Size
+from game import GameModel
+
+
+def run(fixed_point, ticks):
+    game = GameModel(Size(1000, 700), seed=0, fixed_point=fixed_point)
+    elapsed = 0
+    for _ in range(ticks):
+        if game.gameover or game.won:
+            game = GameModel(Size(1000, 700), seed=0,
+                             fixed_point=fixed_point)
+        if game.balls:
+            game.move_ship_to(game.balls[0].x - 80)
+        game.release_ball_or_shoot()
+        started = time.perf_counter()
+        game.tick()
+        elapsed += time.perf_counter() - started
+    return ticks / elapsed
+
+
+def main(ticks=20000):
+    for name, fixed_point in (('float', False), ('fixed', True)):
+        print('%-6s %10.0f ticks/s' % (name, run(fixed_point, ticks)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import time
+from core import Event
+from telemetry import Telemetry
+
+
+def per_line(path, events):
+    with open(path, 'w') as file:
+        started = time.perf_counter()
+        for tick in range(events):
+            file.write('%s %s %s %s %s %s\n' % (
+                tick, Event.BlockHit.value, 1, 10.5, 20.5, 2))
+            file.flush()
+        return time.perf_counter() - started
+
+
+def columnar(path, events):
+    telemetry = Telemetry(path)
+    started = time.perf_counter()
+    for tick in range(events):
+        telemetry.record(tick, Event.BlockHit.value, 1, 10.5, 20.5, 2)
+    elapsed = time.perf_counter() - started
+    telemetry.close()
+    return elapsed
+
+
+def main(events=200000):
+    with tempfile.TemporaryDirectory() as directory:
+        for name, sink in (('per line', per_line), ('columnar', columnar)):
+            path = os.path.join(directory, name)
+            elapsed = sink(path, events)
+            print('%-9s %6.2f us/event  %8s bytes' % (
+                name, elapsed / events * 1e6, os.path.getsize(path)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -9,13 +9,17 @@ class Bonus(MovingEntity):
                          velocity=settings.bonus_velocity,
                          direction=settings.bonus_direction)
 
+    def reset(self, x, y, settings):
+        super().reset(x, y, settings.bonus_size, settings.bonus_velocity,
+                      settings.bonus_direction)
+
     def activate(self, game):
         raise NotImplementedError('This method must be overridden in child \
                                    class implementation')
 
     @staticmethod
-    def get_random_bonus():
-        return random.choice(BONUSES)
+    def get_random_bonus(rng=random):
+        return rng.choice(BONUSES)
 
 
 class DecreaseBonus(Bonus):
@@ -81,7 +85,7 @@ class TripleBallBonus(Bonus):
         super().__init__(x, y, settings)
 
     def activate(self, game):
-        random.choice(game.balls).twin(game)
+        game.random.choice(game.balls).twin(game)
 
 
 BONUSES = [DecreaseBonus, ExpandBonus, BulletBonus, FireBallBonus,
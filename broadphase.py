@@ -0,0 +1,68 @@
+class SweepAndPrune:
+    def __init__(self):
+        self.entities = []
+        self._members = set()
+
+    def update(self, entities):
+        current = set(entities)
+        if current != self._members:
+            kept = [entity for entity in self.entities if entity in current]
+            added = [entity for entity in entities
+                     if entity not in self._members]
+            self.entities = kept + added
+            self._members = current
+        self._sort()
+
+    def _sort(self):
+        entities = self.entities
+        for i in range(1, len(entities)):
+            entity = entities[i]
+            key = entity.frame.x
+            j = i - 1
+            while j >= 0 and entities[j].frame.x > key:
+                entities[j + 1] = entities[j]
+                j -= 1
+            entities[j + 1] = entity
+
+    def _bands(self):
+        height = max(entity.frame.height for entity in self.entities) or 1
+        bands = {}
+        for rank, entity in enumerate(self.entities):
+            frame = entity.frame
+            bands.setdefault(int(frame.y // height), []).append(
+                (frame.x, frame.x + frame.width, frame.y,
+                 frame.y + frame.height, rank))
+        return bands
+
+    def pairs(self):
+        entities = self.entities
+        if len(entities) < 2:
+            return
+        bands = self._bands()
+        found = []
+        for key, band in bands.items():
+            upper = bands.get(key + 1, ())
+            limit = len(upper)
+            start = 0
+            count = len(band)
+            for i in range(count):
+                left, right, top, bottom, rank = band[i]
+                for j in range(i + 1, count):
+                    other = band[j]
+                    if other[0] > right:
+                        break
+                    if other[2] <= bottom and top <= other[3]:
+                        found.append((rank, other[4]))
+                while start < limit and upper[start][1] < left:
+                    start += 1
+                for j in range(start, limit):
+                    other = upper[j]
+                    if other[0] > right:
+                        break
+                    if other[1] >= left and other[2] <= bottom and \
+                            top <= other[3]:
+                        found.append((rank, other[4]) if rank < other[4]
+                                     else (other[4], rank))
+        found.sort()
+        for one, other in found:
+            yield entities[one], entities[other]
@@ -0,0 +1,128 @@
+from bisect import bisect_right
+from core import Frame, BlockType
+
+
+SEAM = 1e-6
+
+
+class Wall:
+    def __init__(self, frame, tiles):
+        self.frame = frame
+        self.tiles = tiles
+
+
+class Row:
+    def __init__(self, tiles):
+        self.tiles = sorted(tiles, key=lambda tile: tile.x)
+        self.lefts = [tile.x for tile in self.tiles]
+        self.top = min(tile.top for tile in self.tiles)
+        self.bottom = max(tile.bottom for tile in self.tiles)
+        self.spans = {}
+        self._summarize()
+
+    def _summarize(self):
+        self.spans.clear()
+        for run in runs(self.tiles):
+            span = Frame(run[0].x, self.top, run[-1].right - run[0].x,
+                         self.bottom - self.top)
+            for tile in run:
+                self.spans[tile] = span
+
+    def remove(self, tile):
+        index = self.tiles.index(tile)
+        del self.tiles[index]
+        del self.lefts[index]
+        self._summarize()
+
+    def collect(self, entity, hits):
+        index = bisect_right(self.lefts, entity.right) - 1
+        left = entity.left
+        tiles = self.tiles
+        while index >= 0 and tiles[index].right >= left:
+            if tiles[index].intersects_with(entity):
+                hits.add(tiles[index])
+            index -= 1
+
+
+def runs(tiles):
+    run = []
+    for tile in tiles:
+        if run and abs(run[-1].right - tile.x) > SEAM:
+            yield run
+            run = []
+        run.append(tile)
+    if run:
+        yield run
+
+
+def merge_walls(tiles):
+    rows = {}
+    for tile in tiles:
+        rows.setdefault(tile.y, []).append(tile)
+
+    strips = []
+    for y in sorted(rows):
+        for run in runs(sorted(rows[y], key=lambda tile: tile.x)):
+            strips.append(Wall(Frame(run[0].x, y, run[-1].right - run[0].x,
+                                     run[0].height), run))
+
+    walls = []
+    open_walls = {}
+    for strip in strips:
+        frame = strip.frame
+        key = (frame.x, frame.width)
+        wall = open_walls.get(key)
+        if wall is not None and abs(wall.frame.bottom - frame.y) <= SEAM:
+            wall.frame.height = frame.bottom - wall.frame.y
+            wall.tiles.extend(strip.tiles)
+        else:
+            open_walls[key] = strip
+            walls.append(strip)
+    return walls
+
+
+class LevelColliders:
+    def __init__(self, blocks):
+        self.key = (id(blocks), len(blocks))
+        walls = [block for block in blocks
+                 if block.type == BlockType.Unbreakable]
+        self.walls = merge_walls(walls)
+        self._walls = {tile: wall for wall in self.walls
+                       for tile in wall.tiles}
+
+        rows = {}
+        for block in blocks:
+            if block.type != BlockType.Unbreakable:
+                rows.setdefault(block.y, []).append(block)
+        self.rows = [Row(rows[y]) for y in sorted(rows)]
+        self._rows = {tile: row for row in self.rows for tile in row.tiles}
+
+    def is_current(self, blocks):
+        return self.key == (id(blocks), len(blocks))
+
+    def collect(self, entity, hits):
+        for wall in self.walls:
+            if wall.frame.intersects_with(entity.frame):
+                for tile in wall.tiles:
+                    if tile.intersects_with(entity):
+                        hits.add(tile)
+        top = entity.top
+        bottom = entity.bottom
+        for row in self.rows:
+            if row.top <= bottom and row.bottom >= top and row.tiles:
+                row.collect(entity, hits)
+
+    def surface(self, tile):
+        wall = self._walls.get(tile)
+        if wall is not None:
+            return wall.frame
+        row = self._rows.get(tile)
+        if row is not None:
+            return row.spans.get(tile, tile.frame)
+        return tile.frame
+
+    def remove(self, tile):
+        row = self._rows.pop(tile, None)
+        if row is not None:
+            row.remove(tile)
+            self.key = (self.key[0], self.key[1] - 1)
@@ -124,6 +124,16 @@ class BlockType(Enum):
     Unbreakable = float('inf')
 
 
+class Event(Enum):
+    LevelStarted = 0
+    LevelCompleted = 1
+    BlockHit = 2
+    BlockDestroyed = 3
+    BallLost = 4
+    BonusSpawned = 5
+    BonusCaught = 6
+
+
 def compare(one, other):
     if one < other:
         return -1
@@ -0,0 +1,75 @@
+import os
+import time
+from level import LevelCreator
+
+
+class LevelWatcher:
+    def __init__(self, path=None, interval=0.5):
+        self.path = path or LevelCreator.path
+        self.interval = interval
+        self._last_poll = None
+        self._mtimes = self._scan()
+
+    def _scan(self):
+        mtimes = {}
+        for filename in LevelCreator.get_level_files(self.path):
+            try:
+                mtimes[filename] = os.stat(filename).st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def poll(self, force=False):
+        now = time.monotonic()
+        if not force and self._last_poll is not None and \
+                now - self._last_poll < self.interval:
+            return []
+        self._last_poll = now
+
+        mtimes = self._scan()
+        changed = [filename for filename, mtime in mtimes.items()
+                   if self._mtimes.get(filename) != mtime]
+        self._mtimes = mtimes
+        return changed
+
+
+class LevelEditor:
+    def __init__(self, game, watcher=None):
+        self.game = game
+        self.watcher = watcher or LevelWatcher()
+
+    @property
+    def current_file(self):
+        files = LevelCreator.get_level_files(self.watcher.path)
+        if 0 <= self.game.level_index < len(files):
+            return files[self.game.level_index]
+        return None
+
+    def refresh(self, force=False):
+        changed = self.watcher.poll(force)
+        if not changed:
+            return set(), set()
+        filename = self.current_file
+        if filename not in changed:
+            return set(), set()
+        blocks = LevelCreator.parse_file(self.game.size, filename,
+                                         self.game.settings)
+        return self.apply_layout(blocks)
+
+    def apply_layout(self, blocks):
+        layout = {LevelEditor._cell(block): block for block in blocks}
+        live = {LevelEditor._cell(block): block for block in self.game.blocks}
+
+        removed = {block for cell, block in live.items()
+                   if cell not in layout or layout[cell].type != block.type}
+        added = {block for cell, block in layout.items()
+                 if cell not in live or live[cell].type != block.type}
+
+        self.game.blocks -= removed
+        self.game.blocks |= added
+        self.game.update_colliders(force=True)
+        return added, removed
+
+    @staticmethod
+    def _cell(block):
+        return block.x, block.y
@@ -1,6 +1,6 @@
 import math
 import os.path
-from functools import reduce
+import fixedpoint
 from core import Frame, BallState, BlockType, Vector
 
 
@@ -78,11 +78,22 @@ class MovingEntity(Entity):
         self.velocity = velocity
         self.direction = Vector.create(direction)
 
+    def reset(self, x, y, size, velocity, direction):
+        self.frame.x = x
+        self.frame.y = y
+        self.frame.width, self.frame.height = size
+        self.velocity = velocity
+        self.direction.x = direction.x
+        self.direction.y = direction.y
+
     def move(self, turn_rate=1):
         dir_angle = self.direction.angle
-        delta_x = math.cos(dir_angle) * self.velocity * turn_rate
-        delta_y = math.sin(dir_angle) * self.velocity * turn_rate
-        self.frame = self.frame.relocate(delta_x, delta_y)
+        self.frame.x += math.cos(dir_angle) * self.velocity * turn_rate
+        self.frame.y += math.sin(dir_angle) * self.velocity * turn_rate
+
+    def fixed_move(self, turn_rate=1):
+        heading, self.direction = fixedpoint.snap(self.direction)
+        fixedpoint.advance(self.frame, heading, self.velocity, turn_rate)
 
 
 class Ship(MovingEntity):
@@ -118,14 +129,23 @@ class Ball(MovingEntity):
         self.state = BallState.Free
         self._settings = settings
 
+    def reset(self, x, y, settings):
+        super().reset(x, y, settings.ball_size, settings.ball_velocity,
+                      settings.ball_direction)
+        self.state = BallState.Free
+        self._settings = settings
+
     @classmethod
     def replicate(cls, instance):
         new_instance = cls(*instance.location, instance._settings)
-        new_instance.direction = Vector.create(instance.direction)
-        new_instance.velocity = instance.velocity
-        new_instance.change_state(instance.state)
+        new_instance.copy_from(instance)
         return new_instance
 
+    def copy_from(self, other):
+        self.direction = Vector.create(other.direction)
+        self.velocity = other.velocity
+        self.change_state(other.state)
+
     def stick_to_ship(self):
         self.change_state(BallState.Caught)
 
@@ -136,48 +156,102 @@ class Ball(MovingEntity):
         if self.state != BallState.Caught:
             super().move()
         else:
-            self.frame = self.frame.relocate(delta_x, 0)
+            self.frame.x += delta_x
+
+    def fixed_move(self, delta_x=None):
+        if self.state != BallState.Caught:
+            super().fixed_move()
+        else:
+            self.frame.x = fixedpoint.quantize(self.frame.x + delta_x)
 
     def accelerate(self):
         self.velocity = 1.5 * self._settings.ball_velocity
 
-    def reflect_from_block(self, block):
+    def reflect_from_block(self, block, fixed_point=False, surface=None):
         if self.state != BallState.Fiery or \
            block.type == BlockType.Unbreakable:
-            delta = self.center - block.center
-            self.direction = self.direction.normalize()
+            surface = surface or block.frame
+            delta = self.center - surface.center
+            if fixed_point:
+                _, self.direction = fixedpoint.snap(self.direction)
+                cos = self.direction.x
+            else:
+                self.direction = self.direction.normalize()
+                cos = math.cos(self.direction.angle)
 
-            if abs(delta.x) - math.cos(self.direction.angle) / 3 * \
-                    self.velocity <= block.width / 2:
+            if abs(delta.x) - cos / 3 * self.velocity <= surface.width / 2:
                 self.direction.y = -self.direction.y
             else:
                 self.direction.x = -self.direction.x
 
     def smash_blocks(self, game, blocks_to_remove):
-        def vector_min(one, other):
-            one_length = (self.center - one.center).length
-            other_length = (self.center - other.center).length
-            return one if one_length < other_length else other
+        def distance(block):
+            return (self.center - block.center).length, block.y, block.x
 
-        block = reduce(lambda acc, item: vector_min(acc, item),
-                       blocks_to_remove)
-        self.reflect_from_block(block)
+        nearest = min(blocks_to_remove, key=distance)
+        self.reflect_from_block(nearest, game.fixed_point,
+                                game.colliders.surface(nearest))
 
         for block in blocks_to_remove:
-            block.get_hit()
+            game.hit_block(block)
         removable = {block for block in blocks_to_remove
                      if block.is_destroyable}
-        game.blocks -= removable
+        game.remove_blocks(removable)
 
         if removable:
-            game.try_get_bonus(block)
+            game.try_get_bonus(min(removable, key=distance))
             game.player.get_scores(removable)
 
+    def collide_with(self, other):
+        if BallState.Caught in (self.state, other.state):
+            return False
+        normal = other.center - self.center
+        distance = normal.length
+        reach = (self.width + other.width) / 2
+        if distance == 0 or distance >= reach:
+            return False
+        normal = Vector(normal.x / distance, normal.y / distance)
+
+        one = self.direction.normalize()
+        two = other.direction.normalize()
+        one_x, one_y = one.x * self.velocity, one.y * self.velocity
+        two_x, two_y = two.x * other.velocity, two.y * other.velocity
+        approach = (one_x - two_x) * normal.x + (one_y - two_y) * normal.y
+        if approach <= 0:
+            return False
+
+        self.direction = Ball._bounced(one_x - approach * normal.x,
+                                       one_y - approach * normal.y,
+                                       Vector(-normal.x, -normal.y))
+        other.direction = Ball._bounced(two_x + approach * normal.x,
+                                        two_y + approach * normal.y, normal)
+
+        push = (reach - distance) / 2
+        self.frame.x -= normal.x * push
+        self.frame.y -= normal.y * push
+        other.frame.x += normal.x * push
+        other.frame.y += normal.y * push
+        return True
+
+    @staticmethod
+    def _bounced(x, y, fallback):
+        if x == 0 and y == 0:
+            return fallback
+        return Vector(x, y).normalize()
+
     def twin(self, game):
-        ball_two = Ball.replicate(self)
-        ball_two.direction = ball_two.direction.rotate(-math.pi / 3)
-        ball_three = Ball.replicate(self)
-        ball_three.direction = ball_three.direction.rotate(math.pi / 3)
+        ball_two = game.pool.acquire(Ball, *self.location, self._settings)
+        ball_two.copy_from(self)
+        ball_three = game.pool.acquire(Ball, *self.location, self._settings)
+        ball_three.copy_from(self)
+        if game.fixed_point:
+            sixth = fixedpoint.ANGLES // 6
+            ball_two.direction = fixedpoint.rotate(ball_two.direction, -sixth)
+            ball_three.direction = fixedpoint.rotate(ball_three.direction,
+                                                     sixth)
+        else:
+            ball_two.direction = ball_two.direction.rotate(-math.pi / 3)
+            ball_three.direction = ball_three.direction.rotate(math.pi / 3)
         game.balls.append(ball_two)
         game.balls.append(ball_three)
 
@@ -194,6 +268,10 @@ class Bullet(MovingEntity):
                          velocity=settings.bullet_velocity,
                          direction=settings.bullet_direction)
 
+    def reset(self, x, y, settings):
+        super().reset(x, y, settings.bullet_size, settings.bullet_velocity,
+                      settings.bullet_direction)
+
 
 class Block(Entity):
     def __init__(self, x, y, block_type, settings):
@@ -208,5 +286,11 @@ class Block(Entity):
     def is_destroyable(self):
         return self.hits >= self.type.value
 
+    @property
+    def remaining_hits(self):
+        if self.type == BlockType.Unbreakable:
+            return -1
+        return self.type.value - self.hits
+
     def get_image(self):
         return os.path.join('images', '%sblock' % self.type.name.lower())
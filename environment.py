@@ -0,0 +1,177 @@
+import math
+import numpy as np
+from bonuses import Bonus
+from core import Size, BallState, BlockType
+from entities import Ship, Ball, Bullet
+from game import GameModel
+
+
+class Rasterizer:
+    shades = {
+        Ship: 255,
+        Ball: 230,
+        Bullet: 200,
+        Bonus: 170,
+        BlockType.Common: 110,
+        BlockType.Strong: 140,
+        BlockType.Unbreakable: 70,
+    }
+
+    def __init__(self, game_size, resolution=(84, 84)):
+        self.width, self.height = resolution
+        self.scale_x = self.width / game_size.width
+        self.scale_y = self.height / game_size.height
+        self.buffer = np.zeros((self.height, self.width), dtype=np.uint8)
+        self._blocks_layer = np.zeros_like(self.buffer)
+        self._blocks_key = None
+
+    def render(self, game):
+        blocks_key = (id(game.blocks), len(game.blocks))
+        if blocks_key != self._blocks_key:
+            self._blocks_layer.fill(0)
+            for block in game.blocks:
+                self.fill(self._blocks_layer, block, self.shades[block.type])
+            self._blocks_key = blocks_key
+
+        buffer = self.buffer
+        np.copyto(buffer, self._blocks_layer)
+        self.fill(buffer, game.ship, self.shades[Ship])
+        for ball in game.balls:
+            self.fill(buffer, ball, self.shades[Ball])
+        for bullet in game.bullets:
+            self.fill(buffer, bullet, self.shades[Bullet])
+        for bonus in game.bonuses:
+            self.fill(buffer, bonus, self.shades[Bonus])
+        return buffer
+
+    def fill(self, buffer, entity, shade):
+        left = max(int(entity.left * self.scale_x), 0)
+        top = max(int(entity.top * self.scale_y), 0)
+        right = min(max(math.ceil(entity.right * self.scale_x), left + 1),
+                    self.width)
+        bottom = min(max(math.ceil(entity.bottom * self.scale_y), top + 1),
+                     self.height)
+        if left < right and top < bottom:
+            buffer[top:bottom, left:right] = shade
+
+
+class FeatureExtractor:
+    max_balls = 3
+    max_bonuses = 2
+    grid = Size(12, 12)
+
+    def __init__(self, game_size):
+        self.game_size = game_size
+        self.size = 4 + 6 * self.max_balls + 3 * self.max_bonuses + \
+            self.grid.width * self.grid.height
+        self.buffer = np.zeros(self.size, dtype=np.float32)
+        self._grid = np.zeros(self.grid.width * self.grid.height,
+                              dtype=np.float32)
+        self._blocks_key = None
+
+    def extract(self, game):
+        width, height = self.game_size
+        features = self.buffer
+        features.fill(0)
+
+        ship = game.ship
+        features[0:4] = (ship.left / width, ship.width / width,
+                         ship.bullets / 12, game.player.lives / 3)
+
+        offset = 4
+        for ball in game.balls[:self.max_balls]:
+            center = ball.center
+            features[offset:offset + 6] = (
+                1, center.x / width, center.y / height, ball.direction.x,
+                ball.direction.y, ball.state == BallState.Caught)
+            offset += 6
+
+        offset = 4 + 6 * self.max_balls
+        for bonus in list(game.bonuses)[:self.max_bonuses]:
+            center = bonus.center
+            features[offset:offset + 3] = (1, center.x / width,
+                                           center.y / height)
+            offset += 3
+
+        offset = 4 + 6 * self.max_balls + 3 * self.max_bonuses
+        features[offset:] = self.block_grid(game)
+        return features
+
+    def block_grid(self, game):
+        blocks_key = (id(game.blocks), len(game.blocks))
+        if blocks_key == self._blocks_key:
+            return self._grid
+
+        width, height = self.game_size
+        columns, rows = self.grid
+        self._grid.fill(0)
+        for block in game.blocks:
+            center = block.center
+            column = min(int(center.x / width * columns), columns - 1)
+            row = min(int(center.y / height * rows), rows - 1)
+            self._grid[row * columns + column] = \
+                -1 if block.type == BlockType.Unbreakable else 1
+        self._blocks_key = blocks_key
+        return self._grid
+
+
+class ArkanoidEnv:
+    NOOP, LEFT, RIGHT, FIRE = range(4)
+    action_count = 4
+
+    def __init__(self, size=Size(1000, 700), observation='features',
+                 resolution=(84, 84), frame_skip=4, frame_stack=1,
+                 seed=None):
+        if observation not in ('features', 'pixels'):
+            raise ValueError('Unknown observation kind: %s' % observation)
+        self.size = size
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.seed = seed
+        if observation == 'pixels':
+            self._observer = Rasterizer(size, resolution)
+            self._observe = self._observer.render
+            shape = (resolution[1], resolution[0])
+            dtype = np.uint8
+        else:
+            self._observer = FeatureExtractor(size)
+            self._observe = self._observer.extract
+            shape = (self._observer.size,)
+            dtype = np.float32
+        self.observation_shape = (frame_stack,) + shape
+        self._stack = np.zeros(self.observation_shape, dtype=dtype)
+        self.game = None
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.game = GameModel(self.size, self.seed, freeze_gc=False)
+        self._stack[:] = self._observe(self.game)
+        return self._stack.copy()
+
+    def step(self, action):
+        if self.game is None:
+            raise RuntimeError('reset() must be called before step()')
+        game = self.game
+        score = game.player.score
+        lives = game.player.lives
+
+        if action == self.FIRE:
+            game.release_ball_or_shoot()
+        turn_rate = -1 if action == self.LEFT else \
+            1 if action == self.RIGHT else 0
+        for _ in range(self.frame_skip):
+            game.tick(turn_rate)
+            if game.gameover or game.won:
+                break
+
+        self._stack[:-1] = self._stack[1:]
+        self._stack[-1] = self._observe(game)
+
+        reward = game.player.score - score
+        done = game.gameover or game.won
+        info = {'lives': game.player.lives,
+                'life_lost': game.player.lives < lives,
+                'level': game.level_index + 1,
+                'ticks': game.ticks}
+        return self._stack.copy(), reward, done, info
@@ -0,0 +1,130 @@
+import math
+from bisect import bisect_left
+from core import Vector
+
+
+FRACTION_BITS = 16
+ONE = 1 << FRACTION_BITS
+ANGLES = 3600
+QUARTER = ANGLES // 4
+OCTANT = ANGLES // 8
+
+_PRECISION = 10 ** 50
+_PI = 314159265358979323846264338327950288419716939937510
+
+
+def _quarter_sine(index):
+    x = 2 * _PI * index // ANGLES
+    term = total = x
+    n = 1
+    while term:
+        term = -term * x * x // (_PRECISION * _PRECISION *
+                                 (2 * n) * (2 * n + 1))
+        total += term
+        n += 1
+    return (total * ONE + _PRECISION // 2) // _PRECISION
+
+
+def _sine_table():
+    quarter = [_quarter_sine(i) for i in range(QUARTER + 1)]
+    table = []
+    for i in range(ANGLES):
+        if i <= QUARTER:
+            table.append(quarter[i])
+        elif i <= 2 * QUARTER:
+            table.append(quarter[2 * QUARTER - i])
+        elif i <= 3 * QUARTER:
+            table.append(-quarter[i - 2 * QUARTER])
+        else:
+            table.append(-quarter[4 * QUARTER - i])
+    return tuple(table)
+
+
+SINE = _sine_table()
+COSINE = tuple(SINE[(i + QUARTER) % ANGLES] for i in range(ANGLES))
+TANGENT = tuple((SINE[i] << 32) // COSINE[i] for i in range(OCTANT + 1))
+HEADINGS = {(COSINE[i] / ONE, SINE[i] / ONE): i for i in range(ANGLES)}
+
+
+def to_fixed(value):
+    return math.floor(value * ONE)
+
+
+def to_float(fixed):
+    return fixed / ONE
+
+
+def quantize(value):
+    return to_float(to_fixed(value))
+
+
+def unit_vector(heading):
+    heading %= ANGLES
+    return Vector(COSINE[heading] / ONE, SINE[heading] / ONE)
+
+
+def heading_of(vector):
+    heading = HEADINGS.get((vector.x, vector.y))
+    if heading is not None:
+        return heading
+
+    x, y = to_fixed(vector.x), to_fixed(vector.y)
+    if x == 0 and y == 0:
+        return 0
+    if abs(y) <= abs(x):
+        heading = _octant_heading(abs(y), abs(x))
+    else:
+        heading = QUARTER - _octant_heading(abs(x), abs(y))
+    if x < 0:
+        heading = 2 * QUARTER - heading
+    if y < 0:
+        heading = -heading
+    return heading % ANGLES
+
+
+def _octant_heading(small, big):
+    ratio = (small << 32) // big
+    index = bisect_left(TANGENT, ratio)
+    if index > OCTANT:
+        return OCTANT
+    if index > 0 and ratio - TANGENT[index - 1] <= TANGENT[index] - ratio:
+        return index - 1
+    return index
+
+
+def snap(vector):
+    heading = heading_of(vector)
+    if (vector.x, vector.y) in HEADINGS:
+        return heading, vector
+    return heading, unit_vector(heading)
+
+
+def advance(frame, heading, velocity, turn_rate=1):
+    step = to_fixed(velocity) * turn_rate
+    frame.x = to_float(to_fixed(frame.x) +
+                       (COSINE[heading] * step >> FRACTION_BITS))
+    frame.y = to_float(to_fixed(frame.y) +
+                       (SINE[heading] * step >> FRACTION_BITS))
+
+
+def rotate(vector, heading):
+    heading %= ANGLES
+    return Vector(vector.x + COSINE[heading] / ONE,
+                  vector.y + SINE[heading] / ONE)
+
+
+def quantize_frame(frame):
+    frame.x = quantize(frame.x)
+    frame.y = quantize(frame.y)
+
+
+def state(game):
+    entities = tuple((type(entity).__name__,
+                      to_fixed(entity.x), to_fixed(entity.y),
+                      to_fixed(entity.width), to_fixed(entity.height))
+                     for entity in game.get_entities())
+    directions = tuple((to_fixed(ball.direction.x),
+                        to_fixed(ball.direction.y))
+                       for ball in game.balls)
+    return (game.ticks, game.player.score, game.player.lives,
+            tuple(sorted(entities)), directions)
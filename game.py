@@ -1,10 +1,23 @@
 ﻿import random
 from math import pi
 from settings import Settings
-from bonuses import Bonus
+from bonuses import Bonus, DeathBonus, BONUSES
 from entities import Ship, Ball, Bullet
-from core import Frame, BallState, BlockType, Vector
+from core import Frame, BallState, BlockType, Vector, Event
 from level import LevelCreator
+from pool import Pool
+from broadphase import SweepAndPrune
+from colliders import LevelColliders
+from gcstats import freeze_long_lived
+import fixedpoint
+
+
+AIM_PERIOD = 300
+DODGE_DISTANCE = 150
+
+
+def entity_order(entity):
+    return entity.y, entity.x, type(entity).__name__
 
 
 class Player:
@@ -24,19 +37,38 @@ class Player:
 
 
 class GameModel:
-    def __init__(self, size):
+    def __init__(self, size, seed=None, levels=None, fixed_point=False,
+                 telemetry=None, start=0, freeze_gc=True):
         self.size = size
+        self.freeze_gc = freeze_gc
+        self.telemetry = telemetry
+        self.fixed_point = fixed_point
+        self.random = random.Random(seed)
         self.settings = Settings()
         self.frame = Frame(0, 0, *size)
+        self.pool = Pool()
+        self.broadphase = SweepAndPrune()
+        self.ticks = 0
+        self._blocks_to_remove = set()
+        self._bonuses_to_remove = set()
+        self._bullets_to_remove = set()
+        self._caught_bonuses = []
+        self._bullet_hits = set()
+        self.colliders = None
+        self.layout_version = 0
 
         self.player = Player()
-        self.current_level = 1
+        self.current_level = 1 + start
+        self.level_index = start - 1
 
         self.reset()
         self.deadly_height = self.ship.bottom - \
             self.ship.frame.height / 2
 
-        self.levels = LevelCreator.get_levels(self.size, self.settings)
+        if levels is None:
+            levels = LevelCreator.get_levels(self.size, self.settings,
+                                             start)
+        self.levels = iter(levels)
         self.won = False
         self.try_get_next_level()
 
@@ -52,6 +84,13 @@ class GameModel:
         return len({block for block in self.blocks
                     if block.type != BlockType.Unbreakable}) == 0
 
+    def is_quiescent(self, turn_rate=0):
+        if self.gameover or self.won:
+            return True
+        return turn_rate == 0 and not self.bonuses and not self.bullets and \
+            all(ball.state == BallState.Caught for ball in self.balls) and \
+            not self.level_completed
+
     def get_entities(self):
         yield self.ship
         for ball in self.balls:
@@ -72,32 +111,76 @@ class GameModel:
 
     def shooting(self):
         if self.ship.try_shoot():
-            self.bullets.add(Bullet(self.ship.left, self.ship.top,
-                                    self.settings))
-            self.bullets.add(Bullet(self.ship.right, self.ship.top,
-                                    self.settings))
+            self.bullets.add(self.pool.acquire(Bullet, self.ship.left,
+                                               self.ship.top, self.settings))
+            self.bullets.add(self.pool.acquire(Bullet, self.ship.right,
+                                               self.ship.top, self.settings))
+
+    def release_ball_or_shoot(self):
+        if not self.release_ball():
+            self.shooting()
+
+    def autopilot(self):
+        ship = self.ship
+        x = ship.x
+        if self.balls:
+            ball = max(self.balls,
+                       key=lambda ball: (ball.direction.y > 0, ball.y))
+            aim = ((self.ticks // AIM_PERIOD) % 5 - 2) * ship.width / 6
+            x = ball.x + ball.direction.x * ball.velocity + \
+                (ball.width - ship.width) / 2 + aim
+        for bonus in self.bonuses:
+            if isinstance(bonus, DeathBonus) and \
+                    bonus.bottom > ship.top - DODGE_DISTANCE and \
+                    bonus.left < x + ship.width and bonus.right > x:
+                sides = [side for side in (bonus.left - ship.width - 1,
+                                           bonus.right + 1)
+                         if self.frame.left <= side and
+                         side + ship.width <= self.frame.right]
+                if sides:
+                    x = min(sides, key=lambda side: abs(side - x))
+        self.move_ship_to(x)
+        self.release_ball_or_shoot()
+
+    def move_ship_to(self, x):
+        old_x = self.ship.x
+        self.ship.location = (x, self.ship.y)
+        delta_x = self.ship.x - old_x
+        for ball in self.balls:
+            if ball.state == BallState.Caught:
+                self.move_entity(ball, delta_x)
+
+    def set_ball_velocity(self, value):
+        self.settings.ball_velocity = value
+        for ball in self.balls:
+            ball.velocity = value
 
     def tick(self, turn_rate=0):
         if self.gameover or self.won:
             return
+        self.ticks += 1
 
         if self.level_completed:
+            self.record(Event.LevelCompleted)
             self.player.score += 1000 * self.current_level
             if not self.try_get_next_level():
                 return
 
         old_x = self.ship.left
-        self.ship.move(turn_rate)
+        self.move_entity(self.ship, turn_rate)
         self.normalize_ship_location()
         for ball in self.balls:
-            ball.move(self.ship.left - old_x)
+            self.move_entity(ball, self.ship.left - old_x)
         self.hold_ball_in_bounds()
+        self.collide_balls()
         self.check_balls()
 
+        self.update_colliders()
+        blocks_to_remove = self._blocks_to_remove
         for ball in self.balls:
-            blocks_to_remove = {block for block in self.blocks
-                                if block.intersects_with(ball)}
-            if len(blocks_to_remove) != 0:
+            blocks_to_remove.clear()
+            self.colliders.collect(ball, blocks_to_remove)
+            if blocks_to_remove:
                 ball.smash_blocks(self, blocks_to_remove)
 
         self.remove_bonuses()
@@ -105,26 +188,82 @@ class GameModel:
 
         for ball in self.balls:
             if ball.intersects_with(self.ship):
-                mid = self.ship.right - self.ship.width / 2
-                ball_mid = ball.right - ball.width / 2
-                ball.direction = Vector.from_angle(
-                    -pi / 2 + (pi / 2.75 * (ball_mid - mid) /
-                               (self.ship.width / 2)))
+                self.bounce_from_ship(ball)
+
+    def record(self, event, entity=None, value=0):
+        if self.telemetry is None:
+            return
+        x, y = (entity.x, entity.y) if entity is not None else (0, 0)
+        self.telemetry.record(self.ticks, event.value, self.level_index + 1,
+                              x, y, value)
+
+    def move_entity(self, entity, *args):
+        if self.fixed_point:
+            entity.fixed_move(*args)
+        else:
+            entity.move(*args)
+
+    def bounce_from_ship(self, ball):
+        mid = self.ship.right - self.ship.width / 2
+        ball_mid = ball.right - ball.width / 2
+        if self.fixed_point:
+            offset = fixedpoint.to_fixed(ball_mid - mid)
+            width = fixedpoint.to_fixed(self.ship.width)
+            ball.direction = fixedpoint.unit_vector(
+                -fixedpoint.QUARTER +
+                4 * fixedpoint.ANGLES * offset // (11 * width))
+        else:
+            ball.direction = Vector.from_angle(
+                -pi / 2 + (pi / 2.75 * (ball_mid - mid) /
+                           (self.ship.width / 2)))
 
     def try_get_next_level(self):
         self.current_level += 1
+        self.level_index += 1
         try:
             self.blocks = next(self.levels)
+            self.update_colliders(force=True)
+            self.layout_version += 1
             self.reset()
+            if self.freeze_gc:
+                freeze_long_lived()
+            self.record(Event.LevelStarted, value=len(self.blocks))
             return True
         except StopIteration:
             self.won = True
             return False
 
+    def jump_to_level(self, number):
+        if not 1 <= number <= len(LevelCreator.get_level_files()):
+            return False
+        self.current_level = number
+        self.level_index = number - 2
+        self.levels = LevelCreator.get_levels(self.size, self.settings,
+                                              start=number - 1)
+        self.won = False
+        return self.try_get_next_level()
+
+    def update_colliders(self, force=False):
+        if force or not self.colliders.is_current(self.blocks):
+            self.colliders = LevelColliders(self.blocks)
+
+    def hit_block(self, block):
+        block.get_hit()
+        self.layout_version += 1
+        self.record(Event.BlockHit, block, block.remaining_hits)
+
+    def remove_blocks(self, blocks):
+        self.blocks -= blocks
+        for block in blocks:
+            self.colliders.remove(block)
+            self.record(Event.BlockDestroyed, block)
+
     def check_balls(self):
         for ball in self.balls:
             if ball.middle > self.deadly_height:
+                self.record(Event.BallLost, ball)
                 self.balls.remove(ball)
+                self.pool.release(ball)
         if not self.balls:
             self.kill_player()
 
@@ -144,10 +283,19 @@ class GameModel:
         ball_x = self.ship.x + (self.ship.width -
                                 self.settings.ball_size.width) / 2
         ball_y = self.ship.top - self.settings.ball_size.height - 0.01
-        ball = Ball(ball_x, ball_y, self.settings)
+        ball = self.pool.acquire(Ball, ball_x, ball_y, self.settings)
         ball.stick_to_ship()
         self.balls.append(ball)
 
+    def collide_balls(self):
+        if len(self.balls) < 2:
+            return
+        self.broadphase.update(self.balls)
+        for one, other in self.broadphase.pairs():
+            if one.collide_with(other) and self.fixed_point:
+                fixedpoint.quantize_frame(one.frame)
+                fixedpoint.quantize_frame(other.frame)
+
     def normalize_ship_location(self):
         self.ship.location = (min(max(0, self.ship.left),
                                   self.frame.right - self.ship.width),
@@ -163,35 +311,56 @@ class GameModel:
                 ball.direction.y = -ball.direction.y
 
     def try_get_bonus(self, block):
-        chance = random.random()
+        chance = self.random.random()
         if chance > 0.75:
-            bonus_cls = Bonus.get_random_bonus()
-            bonus = bonus_cls(block.left, block.top, self.settings)
+            bonus_cls = Bonus.get_random_bonus(self.random)
+            bonus = self.pool.acquire(bonus_cls, block.left, block.top,
+                                      self.settings)
             self.bonuses.add(bonus)
+            self.record(Event.BonusSpawned, bonus,
+                        BONUSES.index(bonus_cls))
 
     def remove_bonuses(self):
-        bonuses_to_remove = {bonus for bonus in self.bonuses
-                             if not bonus.intersects_with(self)}
+        bonuses_to_remove = self._bonuses_to_remove
+        bonuses_to_remove.clear()
         for bonus in self.bonuses:
-            bonus.move()
+            if not bonus.intersects_with(self):
+                bonuses_to_remove.add(bonus)
+        caught = self._caught_bonuses
+        caught.clear()
+        for bonus in self.bonuses:
+            self.move_entity(bonus)
             if bonus.intersects_with(self.ship):
-                bonus.activate(self)
+                caught.append(bonus)
                 bonuses_to_remove.add(bonus)
 
+        caught.sort(key=entity_order)
+        for bonus in caught:
+            self.record(Event.BonusCaught, bonus, BONUSES.index(type(bonus)))
+            bonus.activate(self)
         self.bonuses -= bonuses_to_remove
+        self.pool.release_all(bonuses_to_remove)
 
     def remove_bullets(self):
-        bullets_to_remove = {bullet for bullet in self.bullets
-                             if not bullet.intersects_with(self)}
-        blocks_to_remove = set()
+        bullets_to_remove = self._bullets_to_remove
+        bullets_to_remove.clear()
+        for bullet in self.bullets:
+            if not bullet.intersects_with(self):
+                bullets_to_remove.add(bullet)
+        blocks_to_remove = self._blocks_to_remove
+        blocks_to_remove.clear()
+        hits = self._bullet_hits
+        self.update_colliders()
         for bullet in self.bullets:
-            bullet.move()
-            for block in self.blocks:
-                if bullet.intersects_with(block):
-                    block.get_hit()
-                    if block.is_destroyable:
-                        blocks_to_remove.add(block)
-                    bullets_to_remove.add(bullet)
+            self.move_entity(bullet)
+            hits.clear()
+            self.colliders.collect(bullet, hits)
+            for block in hits:
+                self.hit_block(block)
+                if block.is_destroyable:
+                    blocks_to_remove.add(block)
+                bullets_to_remove.add(bullet)
 
         self.bullets -= bullets_to_remove
-        self.blocks -= blocks_to_remove
+        self.remove_blocks(blocks_to_remove)
+        self.pool.release_all(bullets_to_remove)
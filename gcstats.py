@@ -0,0 +1,53 @@
+import gc
+import time
+from collections import deque, namedtuple
+
+
+GCPause = namedtuple('GCPause', ['tick', 'generation', 'duration',
+                                 'collected'])
+
+
+def freeze_long_lived():
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
+
+
+class GCMonitor:
+    def __init__(self, game, capacity=1024):
+        self.game = game
+        self.pauses = deque(maxlen=capacity)
+        self._started = None
+
+    def install(self):
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            duration = time.perf_counter() - self._started
+            self._started = None
+            self.pauses.append(GCPause(self.game.ticks, info['generation'],
+                                       duration, info['collected']))
+
+    @property
+    def longest(self):
+        if not self.pauses:
+            return None
+        return max(self.pauses, key=lambda pause: pause.duration)
+
+    def report(self):
+        if not self.pauses:
+            return 'GC pauses: none'
+        total = sum(pause.duration for pause in self.pauses)
+        longest = self.longest
+        return 'GC pauses: %s, total %.2f ms, longest %.2f ms ' \
+               '(generation %s, tick %s)' % (
+                   len(self.pauses), total * 1000, longest.duration * 1000,
+                   longest.generation, longest.tick)
@@ -0,0 +1,107 @@
+import argparse
+import numpy as np
+from core import BlockType
+from level import LevelCreator
+
+
+EMPTY, COMMON, STRONG, UNBREAKABLE = range(4)
+SYMBOLS = np.frombuffer(b'*CSU', dtype=np.uint8)
+BLOCK_TYPES = [None, BlockType.Common, BlockType.Strong, BlockType.Unbreakable]
+POCKET = np.array([[UNBREAKABLE, UNBREAKABLE, UNBREAKABLE],
+                   [UNBREAKABLE, EMPTY, UNBREAKABLE],
+                   [UNBREAKABLE, EMPTY, UNBREAKABLE]], dtype=np.uint8)
+SYMMETRIES = (None, 'horizontal', 'vertical', 'both')
+
+
+class LevelGenerator:
+    def __init__(self, rows=12, columns=12, density=0.7, strong_ratio=0.2,
+                 unbreakable_ratio=0.05, symmetry=None, pockets=0,
+                 seed=None):
+        if symmetry not in SYMMETRIES:
+            raise ValueError('Unknown symmetry: %s' % symmetry)
+        if strong_ratio + unbreakable_ratio > 1:
+            raise ValueError('Strong and unbreakable ratios exceed 1')
+        self.rows = rows
+        self.columns = columns
+        self.density = density
+        self.strong_ratio = strong_ratio
+        self.unbreakable_ratio = unbreakable_ratio
+        self.symmetry = symmetry
+        self.pockets = pockets
+        self.random = np.random.default_rng(seed)
+
+    def grid(self):
+        mirror_columns = self.symmetry in ('horizontal', 'both')
+        mirror_rows = self.symmetry in ('vertical', 'both')
+        rows = (self.rows + 1) // 2 if mirror_rows else self.rows
+        columns = (self.columns + 1) // 2 if mirror_columns else self.columns
+
+        kinds = self.random.random((rows, columns), dtype=np.float32)
+        grid = np.full((rows, columns), COMMON, dtype=np.uint8)
+        grid[kinds < self.unbreakable_ratio + self.strong_ratio] = STRONG
+        grid[kinds < self.unbreakable_ratio] = UNBREAKABLE
+        grid[self.random.random((rows, columns),
+                                dtype=np.float32) >= self.density] = EMPTY
+        self._carve_pockets(grid)
+
+        if mirror_columns:
+            grid = np.hstack([grid, grid[:, ::-1][:, self.columns % 2:]])
+        if mirror_rows:
+            grid = np.vstack([grid, grid[::-1][self.rows % 2:]])
+        return grid
+
+    def _carve_pockets(self, grid):
+        height, width = POCKET.shape
+        rows, columns = grid.shape
+        if not self.pockets or rows < height or columns < width:
+            return
+        tops = self.random.integers(0, rows - height + 1, self.pockets)
+        lefts = self.random.integers(0, columns - width + 1, self.pockets)
+        offsets_y, offsets_x = np.indices(POCKET.shape)
+        grid[tops[:, None, None] + offsets_y,
+             lefts[:, None, None] + offsets_x] = POCKET
+
+    def text(self, grid=None):
+        grid = self.grid() if grid is None else grid
+        lines = np.empty((grid.shape[0], grid.shape[1] + 1), dtype=np.uint8)
+        lines[:, :-1] = SYMBOLS[grid]
+        lines[:, -1] = ord('\n')
+        return lines.tobytes().decode('ascii')[:-1]
+
+    def write(self, filename, grid=None):
+        with open(filename, 'w') as file:
+            file.write(self.text(grid))
+
+    def blocks(self, game_size, settings, grid=None):
+        grid = self.grid() if grid is None else grid
+        rows, columns = np.nonzero(grid)
+        cells = ((i, j, BLOCK_TYPES[code]) for i, j, code in
+                 zip(rows.tolist(), columns.tolist(),
+                     grid[rows, columns].tolist()))
+        return LevelCreator.create_blocks(game_size, cells, grid.shape[1],
+                                          settings)
+
+    def levels(self, game_size, settings, count):
+        for _ in range(count):
+            yield self.blocks(game_size, settings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a level file')
+    parser.add_argument('filename')
+    parser.add_argument('--rows', type=int, default=12)
+    parser.add_argument('--columns', type=int, default=12)
+    parser.add_argument('--density', type=float, default=0.7)
+    parser.add_argument('--strong', type=float, default=0.2)
+    parser.add_argument('--unbreakable', type=float, default=0.05)
+    parser.add_argument('--symmetry', choices=SYMMETRIES[1:])
+    parser.add_argument('--pockets', type=int, default=0)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    LevelGenerator(args.rows, args.columns, args.density, args.strong,
+                   args.unbreakable, args.symmetry, args.pockets,
+                   args.seed).write(args.filename)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+import argparse
+import asyncio
+import gc
+import math
+import multiprocessing
+import os
+import socket
+import struct
+import time
+from array import array
+from collections import namedtuple
+from bonuses import BONUSES
+from core import Size
+from game import GameModel
+from gcstats import freeze_long_lived
+from simulation import Simulation
+
+
+PORT = 7412
+INTERVAL = 0.012
+SATURATION = 0.8
+FREEZE_INTERVAL = 30.0
+
+TURN, MOVE, RELEASE, SHOOT, FIRE, AUTOPILOT, STATS = range(1, 8)
+COMMANDS = {
+    TURN: ('turn', struct.Struct('<b')),
+    MOVE: ('move_ship_to', struct.Struct('<f')),
+    RELEASE: ('release_ball', None),
+    SHOOT: ('shooting', None),
+    FIRE: ('release_ball_or_shoot', None),
+    AUTOPILOT: ('set_autopilot', struct.Struct('<?')),
+}
+
+STATE, LAYOUT, STATISTICS = range(1, 4)
+MESSAGE = struct.Struct('<BI')
+STATE_HEADER = struct.Struct('<IiBBBBBBff')
+LAYOUT_BLOCK = struct.Struct('<ffb')
+STATISTICS_BODY = struct.Struct('<IIdI')
+WON, GAMEOVER = 1, 2
+
+HostState = namedtuple('HostState', ['tick', 'score', 'lives', 'level',
+                                     'won', 'gameover', 'ship_x',
+                                     'ship_width', 'balls', 'bullets',
+                                     'bonuses'])
+HostStatistics = namedtuple('HostStatistics', ['pid', 'sessions',
+                                               'utilization', 'overruns'])
+
+
+def message(kind, payload=b''):
+    return MESSAGE.pack(kind, len(payload)) + payload
+
+
+def encode_state(game, tick):
+    balls = game.balls[:255]
+    bullets = list(game.bullets)[:255]
+    bonuses = list(game.bonuses)[:255]
+    flags = (WON if game.won else 0) | (GAMEOVER if game.gameover else 0)
+    header = STATE_HEADER.pack(
+        tick, game.player.score, min(game.player.lives, 255),
+        game.level_index + 1, flags, len(balls), len(bullets), len(bonuses),
+        game.ship.x, game.ship.width)
+    points = array('f')
+    for entity in balls:
+        points.extend((entity.x, entity.y))
+    for entity in bullets:
+        points.extend((entity.x, entity.y))
+    for entity in bonuses:
+        points.extend((entity.x, entity.y, BONUSES.index(type(entity))))
+    return message(STATE, header + points.tobytes())
+
+
+def decode_state(payload):
+    (tick, score, lives, level, flags, ball_count, bullet_count, bonus_count,
+     ship_x, ship_width) = STATE_HEADER.unpack_from(payload)
+    points = array('f', payload[STATE_HEADER.size:]).tolist()
+    balls = list(zip(points[0:2 * ball_count:2],
+                     points[1:2 * ball_count:2]))
+    points = points[2 * ball_count:]
+    bullets = list(zip(points[0:2 * bullet_count:2],
+                       points[1:2 * bullet_count:2]))
+    points = points[2 * bullet_count:]
+    bonuses = [(points[i], points[i + 1], int(points[i + 2]))
+               for i in range(0, 3 * bonus_count, 3)]
+    return HostState(tick, score, lives, level, bool(flags & WON),
+                     bool(flags & GAMEOVER), ship_x, ship_width, balls,
+                     bullets, bonuses)
+
+
+def encode_layout(blocks):
+    payload = b''.join(LAYOUT_BLOCK.pack(block.x, block.y,
+                                         block.remaining_hits)
+                       for block in blocks)
+    return message(LAYOUT, payload)
+
+
+def decode_layout(payload):
+    return [LAYOUT_BLOCK.unpack_from(payload, offset)
+            for offset in range(0, len(payload), LAYOUT_BLOCK.size)]
+
+
+class Session:
+    def __init__(self, size, writer, seed=None, buffer_limit=1 << 16,
+                 telemetry=None):
+        self.writer = writer
+        self.buffer_limit = buffer_limit
+        self.game = GameModel(size, seed=seed, telemetry=telemetry,
+                              freeze_gc=False)
+        self.layout_version = None
+        self.level = self.game.level_index
+        self.simulation = Simulation(self.game, idle_sleep=False)
+
+    def control(self, command, *args):
+        if command == 'turn':
+            args = (max(-1, min(1, args[0])),)
+        elif command == 'move_ship_to':
+            if not math.isfinite(args[0]):
+                return
+            frame = self.game.frame
+            args = (min(max(frame.left, args[0]),
+                        frame.right - self.game.ship.width),)
+        self.simulation.send(command, *args)
+
+    @property
+    def due(self):
+        return not self.simulation.quiescent or \
+            self.layout_version != self.game.layout_version
+
+    def step(self):
+        self.simulation.advance()
+        level, self.level = self.level, self.game.level_index
+        self.send()
+        return level != self.level
+
+    def send(self):
+        transport = self.writer.transport
+        if transport.is_closing() or \
+                transport.get_write_buffer_size() > self.buffer_limit:
+            return
+        if self.layout_version != self.game.layout_version:
+            self.layout_version = self.game.layout_version
+            self.writer.write(encode_layout(self.game.blocks))
+        self.writer.write(encode_state(self.game, self.simulation.ticks))
+
+
+class Host:
+    def __init__(self, size=Size(1000, 700), interval=INTERVAL, loads=None,
+                 index=0, saturation=SATURATION):
+        self.size = size
+        self.interval = interval
+        self.loads = loads
+        self.index = index
+        self.saturation = saturation
+        self.sessions = set()
+        self.utilization = 0.0
+        self.overruns = 0
+        self.ticks = 0
+        self.frozen = True
+        self.frozen_at = time.monotonic()
+        self._connections = set()
+
+    @property
+    def saturated(self):
+        return self.utilization > self.saturation and bool(self.sessions)
+
+    def statistics(self):
+        return HostStatistics(os.getpid(), len(self.sessions),
+                              self.utilization, self.overruns)
+
+    def step(self):
+        started = time.thread_time()
+        if not self.frozen and \
+                time.monotonic() - self.frozen_at >= FREEZE_INTERVAL:
+            self.freeze()
+        for session in self.sessions:
+            if session.due and session.step():
+                self.frozen = False
+        busy = time.thread_time() - started
+        self.utilization += (busy / self.interval - self.utilization) * 0.1
+        if self.loads is not None:
+            self.loads[self.index] = self.utilization
+        self.ticks += 1
+
+    def freeze(self):
+        freeze_long_lived()
+        self.frozen = True
+        self.frozen_at = time.monotonic()
+
+    async def run_clock(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            self.step()
+            deadline += self.interval
+            delay = deadline - loop.time()
+            if delay < 0:
+                self.overruns += 1
+                deadline = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def serve(self, sock):
+        sock.setblocking(False)
+        self.freeze()
+        clock = asyncio.create_task(self.run_clock())
+        try:
+            await self.accept(sock)
+        finally:
+            clock.cancel()
+
+    async def accept(self, sock):
+        loop = asyncio.get_running_loop()
+        while True:
+            while self.saturated:
+                await asyncio.sleep(self.interval * 10)
+            connection, _ = await loop.sock_accept(sock)
+            task = asyncio.create_task(self.connect(connection))
+            self._connections.add(task)
+            task.add_done_callback(self._connections.discard)
+
+    async def connect(self, connection):
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader, writer = await asyncio.open_connection(sock=connection)
+        await self.handle(reader, writer)
+
+    async def handle(self, reader, writer):
+        session = Session(self.size, writer)
+        self.sessions.add(session)
+        self.frozen = False
+        try:
+            while True:
+                opcode = (await reader.readexactly(1))[0]
+                if opcode == STATS:
+                    writer.write(message(STATISTICS, STATISTICS_BODY.pack(
+                        *self.statistics())))
+                    continue
+                command, arguments = COMMANDS[opcode]
+                args = ()
+                if arguments is not None:
+                    args = arguments.unpack(
+                        await reader.readexactly(arguments.size))
+                session.control(command, *args)
+        except (asyncio.IncompleteReadError, ConnectionError, KeyError):
+            pass
+        finally:
+            self.sessions.discard(session)
+            gc.unfreeze()
+            self.frozen = False
+            writer.close()
+
+
+class HostClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.layout = []
+
+    @classmethod
+    async def connect(cls, address='127.0.0.1', port=PORT):
+        reader, writer = await asyncio.open_connection(address, port)
+        writer.transport.get_extra_info('socket').setsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(reader, writer)
+
+    def send(self, opcode, *args):
+        arguments = COMMANDS[opcode][1] if opcode in COMMANDS else None
+        payload = arguments.pack(*args) if arguments is not None else b''
+        self.writer.write(bytes([opcode]) + payload)
+
+    async def receive(self):
+        kind, size = MESSAGE.unpack(
+            await self.reader.readexactly(MESSAGE.size))
+        payload = await self.reader.readexactly(size)
+        if kind == STATE:
+            return decode_state(payload)
+        if kind == LAYOUT:
+            self.layout = decode_layout(payload)
+            return self.layout
+        return HostStatistics(*STATISTICS_BODY.unpack(payload))
+
+    async def state(self):
+        while True:
+            received = await self.receive()
+            if isinstance(received, HostState):
+                return received
+
+    async def statistics(self):
+        self.send(STATS)
+        while True:
+            received = await self.receive()
+            if isinstance(received, HostStatistics):
+                return received
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def serve_worker(sock, interval, loads, index, saturation):
+    host = Host(interval=interval, loads=loads, index=index,
+                saturation=saturation)
+    try:
+        asyncio.run(host.serve(sock))
+    except KeyboardInterrupt:
+        pass
+
+
+class Supervisor:
+    def __init__(self, address='127.0.0.1', port=PORT, workers=None,
+                 interval=INTERVAL, saturation=SATURATION):
+        self.max_workers = workers or os.cpu_count() or 1
+        self.interval = interval
+        self.saturation = saturation
+        self.socket = socket.create_server((address, port), backlog=1024)
+        self.context = multiprocessing.get_context('spawn')
+        self.loads = self.context.Array('d', self.max_workers, lock=False)
+        self.workers = []
+
+    @property
+    def port(self):
+        return self.socket.getsockname()[1]
+
+    def start_worker(self):
+        index = len(self.workers)
+        worker = self.context.Process(
+            target=serve_worker, daemon=True,
+            args=(self.socket, self.interval, self.loads, index,
+                  self.saturation))
+        worker.start()
+        self.workers.append(worker)
+        return worker
+
+    def balance(self):
+        if not self.workers:
+            self.start_worker()
+        elif len(self.workers) < self.max_workers and \
+                all(self.loads[i] > self.saturation
+                    for i in range(len(self.workers))):
+            self.start_worker()
+
+    def run(self, check_interval=1.0):
+        try:
+            while True:
+                self.balance()
+                time.sleep(check_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        for worker in self.workers:
+            worker.terminate()
+        for worker in self.workers:
+            worker.join()
+        self.socket.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Host remote game sessions')
+    parser.add_argument('--address', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int,
+                        help='maximum worker processes (default: cores)')
+    parser.add_argument('--interval', type=float, default=INTERVAL)
+    args = parser.parse_args()
+    supervisor = Supervisor(args.address, args.port, args.workers,
+                            args.interval)
+    print('Hosting on %s:%s' % (args.address, supervisor.port))
+    supervisor.run()
+
+
+if __name__ == '__main__':
+    main()
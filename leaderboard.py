@@ -0,0 +1,166 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+
+Run = namedtuple('Run', ['player', 'score', 'level_set', 'level', 'created'])
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level_set TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_level_set
+    ON runs (level_set, score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_player
+    ON runs (player, score DESC);
+'''
+
+_STOP = object()
+
+
+class Leaderboard:
+    path = os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                        'leaderboard.db')
+
+    def __init__(self, path=None, top_size=10, batch_size=512,
+                 flush_interval=0.25):
+        self.path = path or Leaderboard.path
+        self.top_size = top_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = queue.Queue()
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+        self.loaded = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def submit(self, player, score, level_set, level):
+        run = Run(player, score, level_set, level, time.time())
+        self._cache_run(run)
+        self._pending.put(run)
+        return run
+
+    def cached_top(self, level_set):
+        with self._cache_lock:
+            return list(self._cache.get(level_set, ()))
+
+    def top(self, level_set, limit=None):
+        return self._query(
+            'SELECT player, score, level_set, level, created FROM runs '
+            'WHERE level_set = ? ORDER BY score DESC LIMIT ?',
+            (level_set, limit or self.top_size))
+
+    def player_top(self, player, level_set=None, limit=None):
+        if level_set is None:
+            return self._query(
+                'SELECT player, score, level_set, level, created FROM runs '
+                'WHERE player = ? ORDER BY score DESC LIMIT ?',
+                (player, limit or self.top_size))
+        return self._query(
+            'SELECT player, score, level_set, level, created FROM runs '
+            'WHERE player = ? AND level_set = ? ORDER BY score DESC LIMIT ?',
+            (player, level_set, limit or self.top_size))
+
+    def count(self):
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM runs').fetchone()[0]
+
+    def flush(self):
+        done = threading.Event()
+        self._pending.put(done)
+        done.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._pending.put(_STOP)
+            self._writer.join()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _query(self, sql, parameters):
+        rows = self._connection().execute(sql, parameters).fetchall()
+        return [Run(*row) for row in rows]
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = Leaderboard._connect(self.path)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _connect(path):
+        connection = sqlite3.connect(path, timeout=30)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _cache_run(self, run):
+        with self._cache_lock:
+            top = self._cache.setdefault(run.level_set, [])
+            if len(top) < self.top_size or run.score > top[-1].score:
+                top.append(run)
+                top.sort(key=lambda item: item.score, reverse=True)
+                del top[self.top_size:]
+
+    def _load_cache(self, connection):
+        level_sets = [row[0] for row in connection.execute(
+            'SELECT DISTINCT level_set FROM runs')]
+        for level_set in level_sets:
+            rows = connection.execute(
+                'SELECT player, score, level_set, level, created FROM runs '
+                'WHERE level_set = ? ORDER BY score DESC LIMIT ?',
+                (level_set, self.top_size)).fetchall()
+            for row in rows:
+                self._cache_run(Run(*row))
+        self.loaded.set()
+
+    def _write_loop(self):
+        connection = Leaderboard._connect(self.path)
+        try:
+            self._load_cache(connection)
+            stopping = False
+            while not stopping:
+                batch, waiters, stopping = self._collect_batch()
+                if batch:
+                    with connection:
+                        connection.executemany(
+                            'INSERT INTO runs (player, score, level_set, '
+                            'level, created) VALUES (?, ?, ?, ?, ?)', batch)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            self.loaded.set()
+            connection.close()
+
+    def _collect_batch(self):
+        batch, waiters = [], []
+        item = self._pending.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if item is _STOP:
+                return batch, waiters, True
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                return batch, waiters, False
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, waiters, False
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._pending.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                return batch, waiters, False
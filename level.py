@@ -13,38 +13,52 @@ class LevelCreator:
     }
 
     @staticmethod
-    def get_levels(game_size, settings):
-        for level in LevelCreator.create_from_files(game_size, settings):
+    def get_levels(game_size, settings, start=0):
+        for level in LevelCreator.create_from_files(game_size, settings,
+                                                    start):
             yield level
 
     @staticmethod
-    def create_from_files(game_size, settings):
-        path = LevelCreator.path
-        files = [os.path.join(path, filename) for filename in os.listdir(path)
-                 if filename.endswith('.txt')]
-        for filename in files:
-            with open(filename) as file:
-                rows = file.read().split('\n')
-                yield LevelCreator.parse_rows(game_size, rows, settings)
+    def get_level_files(path=None):
+        path = path or LevelCreator.path
+        return [os.path.join(path, filename)
+                for filename in sorted(os.listdir(path))
+                if filename.endswith('.txt')]
+
+    @staticmethod
+    def create_from_files(game_size, settings, start=0):
+        for filename in LevelCreator.get_level_files()[start:]:
+            yield LevelCreator.parse_file(game_size, filename, settings)
+
+    @staticmethod
+    def parse_file(game_size, filename, settings):
+        with open(filename) as file:
+            rows = file.read().split('\n')
+        return LevelCreator.parse_rows(game_size, rows, settings)
 
     @staticmethod
     def parse_rows(game_size, raw_rows, settings):
-        blocks = set()
         row_count = min(12, len(raw_rows))
         column_count = min(12, max([len(row) for row in raw_rows]))
         raw_rows = raw_rows[:row_count]
 
+        cells = ((i, j, LevelCreator.block_types.get(row[j]))
+                 for i, row in enumerate(raw_rows)
+                 for j in range(min(len(row), column_count)))
+        return LevelCreator.create_blocks(game_size, cells, column_count,
+                                          settings)
+
+    @staticmethod
+    def create_blocks(game_size, cells, column_count, settings):
+        blocks = set()
         width = (game_size.width - column_count *
                  settings.brick_size.width) / 2
         height = 50
-        for i in range(row_count):
-            row = raw_rows[i]
-            for j in range(min(len(row), column_count)):
-                block_type = LevelCreator.block_types.get(row[j])
-                if block_type:
-                    block = LevelCreator._create_block(i, j, width, height,
-                                                       block_type, settings)
-                    blocks.add(block)
+        for i, j, block_type in cells:
+            if block_type:
+                block = LevelCreator._create_block(i, j, width, height,
+                                                   block_type, settings)
+                blocks.add(block)
         return blocks
 
     @staticmethod
@@ -0,0 +1,27 @@
+from collections import defaultdict
+
+
+class Pool:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._free = defaultdict(list)
+
+    def acquire(self, cls, *args):
+        free = self._free[cls]
+        if free:
+            instance = free.pop()
+            instance.reset(*args)
+            return instance
+        return cls(*args)
+
+    def release(self, instance):
+        free = self._free[type(instance)]
+        if len(free) < self.capacity:
+            free.append(instance)
+
+    def release_all(self, instances):
+        for instance in instances:
+            self.release(instance)
+
+    def free_count(self, cls):
+        return len(self._free[cls])
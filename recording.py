@@ -0,0 +1,150 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import namedtuple
+import numpy as np
+from core import Size
+from game import GameModel
+from simulation import Simulation
+
+
+FORMATS = ('png', 'rgb')
+RAW_FILENAME = 'frames.rgb'
+
+Run = namedtuple('Run', ['seed', 'fixed_point', 'playfield', 'ticks',
+                         'inputs', 'start'], defaults=(0,))
+
+
+def new_run(playfield, fixed_point=False, seed=None, start=0):
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    return Run(seed, fixed_point, (playfield.width, playfield.height), 0, [],
+               start)
+
+
+def save_run(path, run):
+    with open(path, 'w') as file:
+        json.dump(run._asdict(), file)
+
+
+def load_run(path):
+    with open(path) as file:
+        return Run(**json.load(file))
+
+
+def replay(run, start=0, stop=None):
+    stop = run.ticks + 1 if stop is None else min(stop, run.ticks + 1)
+    game = GameModel(Size(*run.playfield), seed=run.seed,
+                     fixed_point=run.fixed_point, start=run.start)
+    simulation = Simulation(game, idle_sleep=False)
+    inputs = iter(run.inputs)
+    pending = next(inputs, None)
+    for tick in range(stop):
+        if tick >= start:
+            yield simulation.snapshots.read()
+        if tick == stop - 1:
+            return
+        while pending is not None and pending[0] == tick:
+            simulation.send(pending[1], *pending[2])
+            pending = next(inputs, None)
+        if tick + 1 >= start:
+            simulation.step()
+        else:
+            simulation.advance()
+
+
+def frame_ranges(start, stop, count):
+    bounds = np.linspace(start, stop, count + 1).round().astype(int)
+    return [(int(first), int(last))
+            for first, last in zip(bounds[:-1], bounds[1:]) if first < last]
+
+
+def render_range(job):
+    run, origin, start, stop, directory, format, scale = job
+    from PyQt5.QtGui import QImage, QPainter, QBrush
+    from renderer import FrameRenderer, offscreen_application
+    offscreen_application()
+
+    renderer = FrameRenderer(Size(*run.playfield), scale)
+    size = renderer.size()
+    frame = QImage(size, QImage.Format_RGB32)
+    background = QBrush(QImage(os.path.join('images', 'space.png')))
+    painter = QPainter()
+    raw = None
+    if format == 'rgb':
+        frame_bytes = size.width() * size.height() * 3
+        raw = open(os.path.join(directory, RAW_FILENAME), 'r+b')
+        raw.seek((start - origin) * frame_bytes)
+    try:
+        for index, snapshot in enumerate(replay(run, start, stop), start):
+            painter.begin(frame)
+            painter.fillRect(frame.rect(), background)
+            painter.drawImage(0, 0, renderer.render(snapshot))
+            painter.end()
+            if raw is None:
+                frame.save(os.path.join(directory, 'frame_%06d.png' % index))
+            else:
+                raw.write(rgb_bytes(frame))
+    finally:
+        if raw is not None:
+            raw.close()
+    return stop - start
+
+
+def rgb_bytes(image):
+    from PyQt5.QtGui import QImage
+    image = image.convertToFormat(QImage.Format_RGB888)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, np.uint8).reshape(image.height(),
+                                                 image.bytesPerLine())
+    return rows[:, :image.width() * 3].tobytes()
+
+
+def export(run, directory, format='png', workers=None, start=0, stop=None,
+           scale=1.0):
+    if format not in FORMATS:
+        raise ValueError('Unknown frame format: %s' % format)
+    stop = run.ticks + 1 if stop is None else min(stop, run.ticks + 1)
+    ranges = frame_ranges(start, stop, workers or os.cpu_count() or 1)
+    os.makedirs(directory, exist_ok=True)
+    if format == 'rgb':
+        width, height = (max(1, round(side * scale))
+                         for side in run.playfield)
+        with open(os.path.join(directory, RAW_FILENAME), 'wb') as file:
+            file.truncate((stop - start) * width * height * 3)
+
+    jobs = [(run, start, first, last, directory, format, scale)
+            for first, last in ranges]
+    if len(jobs) <= 1:
+        return sum(map(render_range, jobs))
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(len(jobs)) as pool:
+        return sum(pool.imap_unordered(render_range, jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Render the frames of a recorded run')
+    parser.add_argument('run')
+    parser.add_argument('directory')
+    parser.add_argument('--format', choices=FORMATS, default='png')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--stop', type=int)
+    parser.add_argument('--scale', type=float, default=1.0)
+    args = parser.parse_args()
+    run = load_run(args.run)
+    started = time.perf_counter()
+    frames = export(run, args.directory, args.format, args.workers,
+                    args.start, args.stop, args.scale)
+    elapsed = time.perf_counter() - started
+    print('%s frames in %.1f s (%.0f frames/s)' % (
+        frames, elapsed, frames / elapsed if elapsed else 0))
+
+
+if __name__ == '__main__':
+    main()
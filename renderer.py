@@ -0,0 +1,77 @@
+import os
+import os.path
+
+from PyQt5.QtGui import QGuiApplication, QPainter, QImage, QFont, QColor
+from PyQt5.QtCore import Qt, QRectF, QLineF, QSize
+
+
+_application = None
+
+
+def offscreen_application():
+    global _application
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    if QGuiApplication.instance() is None:
+        _application = QGuiApplication(['arkanoid-offscreen'])
+    return QGuiApplication.instance()
+
+
+class FrameRenderer:
+    def __init__(self, playfield, scale=1.0):
+        self.playfield = playfield
+        self.scale = scale
+        self.painter = QPainter()
+        self.buffer = None
+        self.images = {}
+
+    def size(self):
+        return QSize(max(1, round(self.playfield.width * self.scale)),
+                     max(1, round(self.playfield.height * self.scale)))
+
+    def render(self, snapshot):
+        size = self.size()
+        if self.buffer is None or self.buffer.size() != size:
+            self.buffer = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        self.buffer.fill(Qt.transparent)
+
+        painter = self.painter
+        painter.begin(self.buffer)
+        painter.scale(size.width() / self.playfield.width,
+                      size.height() / self.playfield.height)
+        self.draw_game(painter, snapshot)
+        painter.end()
+        return self.buffer
+
+    def draw_game(self, painter, snapshot):
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(QFont('Times New Roman', 20))
+        painter.setPen(QColor('gold'))
+
+        painter.drawText(0, 20, 'Scores: %s' % str(snapshot.score))
+
+        painter.drawLine(QLineF(snapshot.left, snapshot.deadly_height,
+                                snapshot.right, snapshot.deadly_height))
+
+        life_img = self.image(os.path.join('images', 'lifebonus.png'))
+        draw_x = self.playfield.width - life_img.width()
+        draw_y = 0
+        for _ in range(snapshot.lives):
+            painter.drawImage(draw_x, draw_y, life_img)
+            draw_x -= life_img.width()
+
+        self.draw_game_elements(painter, snapshot)
+
+    def draw_game_elements(self, painter, snapshot):
+        self.draw_sprites(painter, snapshot.sprites)
+
+    def draw_sprites(self, painter, sprites):
+        for sprite in sprites:
+            painter.drawImage(
+                QRectF(sprite.x, sprite.y, sprite.width, sprite.height),
+                self.image(sprite.image))
+
+    def image(self, path):
+        image = self.images.get(path)
+        if image is None:
+            image = self.images[path] = QImage(path)
+        return image
@@ -2,6 +2,10 @@ from core import Size, Vector
 
 
 class Settings:
+    playfield_size = Size(1920, 1080)
+    render_scale = 1.0
+    turbo_steps = 20
+
     ball_size = Size(35, 35)
     ship_size = Size(200, 25)
     bonus_size = Size(25, 25)
@@ -0,0 +1,249 @@
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+from bonuses import BONUSES
+
+
+NAME = 'arkanoid-state'
+MAGIC = b'ARKS'
+VERSION = 1
+HEADER_SIZE = 128
+
+HEADER = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u4'),
+    ('sequence', '<u8'),
+    ('tick', '<u8'),
+    ('score', '<i8'),
+    ('lives', '<i4'),
+    ('level', '<i4'),
+    ('won', '<u1'),
+    ('gameover', '<u1'),
+    ('padding', '<u2'),
+    ('ball_count', '<u4'),
+    ('bullet_count', '<u4'),
+    ('bonus_count', '<u4'),
+    ('max_balls', '<u4'),
+    ('max_bullets', '<u4'),
+    ('max_bonuses', '<u4'),
+    ('grid_rows', '<u4'),
+    ('grid_columns', '<u4'),
+    ('grid_x', '<f4'),
+    ('grid_y', '<f4'),
+    ('cell_width', '<f4'),
+    ('cell_height', '<f4'),
+])
+
+_published = set()
+
+GameState = namedtuple('GameState', ['sequence', 'tick', 'score', 'lives',
+                                     'level', 'won', 'gameover', 'ship',
+                                     'balls', 'bullets', 'bonuses', 'grid',
+                                     'grid_origin', 'cell_size'])
+
+
+def layout(max_balls, max_bullets, max_bonuses, grid_rows, grid_columns):
+    arrays = [('ship', np.float32, (4,)),
+              ('balls', np.float32, (max_balls, 5)),
+              ('bullets', np.float32, (max_bullets, 2)),
+              ('bonuses', np.float32, (max_bonuses, 3)),
+              ('grid', np.int8, (grid_rows, grid_columns))]
+    offset = HEADER_SIZE
+    fields = {}
+    for name, dtype, shape in arrays:
+        fields[name] = (offset, dtype, shape)
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+        offset = (offset + 7) // 8 * 8
+    return fields, offset
+
+
+def _views(buffer, fields):
+    return {name: np.ndarray(shape, dtype, buffer, offset)
+            for name, (offset, dtype, shape) in fields.items()}
+
+
+class StatePublisher:
+    def __init__(self, name=NAME, max_balls=64, max_bullets=64,
+                 max_bonuses=32, grid_rows=64, grid_columns=64):
+        fields, size = layout(max_balls, max_bullets, max_bonuses,
+                              grid_rows, grid_columns)
+        self.memory = shared_memory.SharedMemory(name, create=True, size=size)
+        _published.add(self.memory.name)
+        self.header = np.ndarray((), HEADER, self.memory.buf)
+        self.sequence = np.ndarray((), '<u8', self.memory.buf,
+                                   HEADER.fields['sequence'][1])
+        self.arrays = _views(self.memory.buf, fields)
+        self._colliders = None
+
+        header = self.header
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['sequence'] = 0
+        header['max_balls'] = max_balls
+        header['max_bullets'] = max_bullets
+        header['max_bonuses'] = max_bonuses
+        header['grid_rows'] = grid_rows
+        header['grid_columns'] = grid_columns
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def publish(self, game, tick):
+        self.sequence[...] += 1
+        try:
+            self._write(game, tick)
+        finally:
+            self.sequence[...] += 1
+
+    def _write(self, game, tick):
+        header = self.header
+        arrays = self.arrays
+        header['tick'] = tick
+        header['score'] = game.player.score
+        header['lives'] = game.player.lives
+        header['level'] = game.level_index + 1
+        header['won'] = game.won
+        header['gameover'] = game.gameover
+
+        ship = game.ship
+        arrays['ship'][:] = (ship.x, ship.y, ship.width, ship.height)
+
+        balls = game.balls[:len(arrays['balls'])]
+        for row, ball in zip(arrays['balls'], balls):
+            row[:] = (ball.x, ball.y, ball.direction.x, ball.direction.y,
+                      ball.state.value)
+        header['ball_count'] = len(balls)
+
+        count = 0
+        rows = arrays['bullets']
+        for bullet in game.bullets:
+            if count == len(rows):
+                break
+            rows[count] = (bullet.x, bullet.y)
+            count += 1
+        header['bullet_count'] = count
+
+        count = 0
+        rows = arrays['bonuses']
+        for bonus in game.bonuses:
+            if count == len(rows):
+                break
+            rows[count] = (bonus.x, bonus.y, BONUSES.index(type(bonus)))
+            count += 1
+        header['bonus_count'] = count
+
+        self._write_grid(game)
+
+    def _write_grid(self, game):
+        header = self.header
+        grid = self.arrays['grid']
+        if game.colliders is not self._colliders:
+            self._colliders = game.colliders
+            brick_size = game.settings.brick_size
+            header['grid_x'] = min((block.x for block in game.blocks),
+                                   default=0)
+            header['grid_y'] = min((block.y for block in game.blocks),
+                                   default=0)
+            header['cell_width'] = brick_size.width
+            header['cell_height'] = brick_size.height
+
+        grid_x = float(header['grid_x'])
+        grid_y = float(header['grid_y'])
+        cell_width = float(header['cell_width'])
+        cell_height = float(header['cell_height'])
+        rows, columns = grid.shape
+        grid.fill(0)
+        for block in game.blocks:
+            row = round((block.y - grid_y) / cell_height)
+            column = round((block.x - grid_x) / cell_width)
+            if 0 <= row < rows and 0 <= column < columns:
+                grid[row, column] = block.remaining_hits
+
+    def close(self):
+        self.header = self.sequence = self.arrays = None
+        self.memory.close()
+        self.memory.unlink()
+        _published.discard(self.memory.name)
+
+
+class StateReader:
+    def __init__(self, name=NAME, track=False):
+        self.memory = shared_memory.SharedMemory(name)
+        if not track and self.memory.name not in _published:
+            self._untrack()
+        self.header = np.ndarray((), HEADER, self.memory.buf)
+        if bytes(self.header['magic']) != MAGIC or \
+                self.header['version'] != VERSION:
+            self.memory.close()
+            raise ValueError('%s is not an arkanoid state segment' % name)
+        self.sequence = np.ndarray((), '<u8', self.memory.buf,
+                                   HEADER.fields['sequence'][1])
+        fields, _ = layout(*(int(self.header[field]) for field in (
+            'max_balls', 'max_bullets', 'max_bonuses', 'grid_rows',
+            'grid_columns')))
+        self.arrays = _views(self.memory.buf, fields)
+
+    def _untrack(self):
+        # Attaching registers the segment with this process's resource
+        # tracker, which would unlink it when the reader exits.
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.memory._name, 'shared_memory')
+        except (ImportError, AttributeError, KeyError):
+            pass
+
+    def read(self, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            before = int(self.sequence)
+            if before % 2 == 0:
+                state = self._copy(before)
+                if int(self.sequence) == before:
+                    return state
+            if time.monotonic() > deadline:
+                raise TimeoutError('Could not read a consistent state')
+            time.sleep(0)
+
+    def _copy(self, sequence):
+        header = self.header.copy()
+        arrays = self.arrays
+        return GameState(
+            sequence, int(header['tick']), int(header['score']),
+            int(header['lives']), int(header['level']),
+            bool(header['won']), bool(header['gameover']),
+            arrays['ship'].copy(),
+            arrays['balls'][:header['ball_count']].copy(),
+            arrays['bullets'][:header['bullet_count']].copy(),
+            arrays['bonuses'][:header['bonus_count']].copy(),
+            arrays['grid'].copy(),
+            (float(header['grid_x']), float(header['grid_y'])),
+            (float(header['cell_width']), float(header['cell_height'])))
+
+    def close(self):
+        self.header = self.sequence = self.arrays = None
+        self.memory.close()
+
+
+def main(name=NAME):
+    reader = StateReader(name)
+    last = None
+    try:
+        while True:
+            state = reader.read()
+            if state.tick != last:
+                last = state.tick
+                print('tick %s score %s lives %s balls %s blocks %s' % (
+                    state.tick, state.score, state.lives, len(state.balls),
+                    int((state.grid != 0).sum())))
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from editor import LevelEditor
+from gcstats import GCMonitor
+
+
+UNRECORDED = ('set_editor', 'set_turbo', 'wake')
+
+Sprite = namedtuple('Sprite', ['x', 'y', 'width', 'height', 'image'])
+
+
+class Snapshot(namedtuple('Snapshot', ['tick', 'sprites', 'score', 'lives',
+                                       'level', 'deadly_height', 'left',
+                                       'right', 'won', 'gameover'])):
+    __slots__ = ()
+
+    @classmethod
+    def capture(cls, game, tick):
+        sprites = tuple(Sprite(entity.x, entity.y, entity.width,
+                               entity.height, entity.get_image())
+                        for entity in game.get_entities())
+        return cls(tick, sprites, game.player.score, game.player.lives,
+                   game.level_index + 1, game.deadly_height,
+                   game.frame.left, game.frame.right, game.won,
+                   game.gameover)
+
+
+class TripleBuffer:
+    def __init__(self, initial=None):
+        self._slots = [initial, initial, initial]
+        self._back, self._middle, self._front = 0, 1, 2
+        self._fresh = False
+        self._swap_lock = threading.Lock()
+
+    def publish(self, value):
+        self._slots[self._back] = value
+        with self._swap_lock:
+            self._back, self._middle = self._middle, self._back
+            self._fresh = True
+
+    def read(self):
+        with self._swap_lock:
+            if self._fresh:
+                self._front, self._middle = self._middle, self._front
+                self._fresh = False
+        return self._slots[self._front]
+
+
+class Simulation(threading.Thread):
+    def __init__(self, game, interval=0.012, idle_sleep=True):
+        super().__init__(daemon=True)
+        self.game = game
+        self.interval = interval
+        self.idle_sleep = idle_sleep
+        self.idle = threading.Event()
+        self.ticks = 0
+        self.turn_rate = 0
+        self.editor = None
+        self.exporter = None
+        self.journal = None
+        self.turbo = 1
+        self.until = None
+        self.autopilot = False
+        self.gc_monitor = GCMonitor(game)
+        self.inputs = queue.Queue()
+        self.sent = 0
+        self.handled = 0
+        self.snapshots = TripleBuffer(Snapshot.capture(game, self.ticks))
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._stopped = threading.Event()
+        self._handlers = {
+            'turn': self._turn,
+            'move_ship_to': game.move_ship_to,
+            'release_ball': game.release_ball,
+            'release_ball_or_shoot': game.release_ball_or_shoot,
+            'shooting': game.shooting,
+            'set_ball_velocity': game.set_ball_velocity,
+            'jump_to_level': game.jump_to_level,
+            'set_editor': self._set_editor,
+            'set_turbo': self._set_turbo,
+            'set_autopilot': self._set_autopilot,
+            'wake': lambda: None,
+        }
+
+    def send(self, command, *args):
+        self.sent += 1
+        self.inputs.put((command, args))
+
+    def step(self):
+        self.process_inputs()
+        for _ in range(self.turbo):
+            self.advance()
+            if self.until is not None and self.until_reached():
+                self._set_turbo(1)
+                break
+        if self.until is None:
+            self.publish()
+
+    def publish(self):
+        self.snapshots.publish(Snapshot.capture(self.game, self.ticks))
+        if self.exporter:
+            self.exporter.publish(self.game, self.ticks)
+
+    def advance(self):
+        self.process_inputs()
+        if self.editor:
+            self.editor.refresh()
+        if self.autopilot:
+            self.game.autopilot()
+        self.game.tick(self.turn_rate)
+        self.ticks += 1
+
+    def process_inputs(self):
+        while True:
+            try:
+                command, args = self.inputs.get_nowait()
+            except queue.Empty:
+                return
+            self.dispatch(command, args)
+            self.handled += 1
+
+    def dispatch(self, command, args):
+        if self.journal is not None and command not in UNRECORDED:
+            self.journal.append((self.ticks, command, args))
+        self._handlers[command](*args)
+
+    @property
+    def quiescent(self):
+        return self.inputs.empty() and self.editor is None and \
+            not self.autopilot and self.game.is_quiescent(self.turn_rate)
+
+    def wait_for_input(self):
+        self.idle.set()
+        command, args = self.inputs.get()
+        self.idle.clear()
+        self.dispatch(command, args)
+        self.handled += 1
+
+    def run(self):
+        self.gc_monitor.install()
+        try:
+            self._loop()
+        finally:
+            self.gc_monitor.uninstall()
+
+    def _loop(self):
+        deadline = time.perf_counter()
+        woken = False
+        while not self._stopped.is_set():
+            if not self._resumed.is_set():
+                self._resumed.wait()
+                deadline = time.perf_counter()
+                continue
+            if self.idle_sleep and not woken and self.quiescent:
+                self.wait_for_input()
+                woken = True
+                deadline = time.perf_counter()
+                continue
+            woken = False
+            self.step()
+            deadline += self.interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                self._stopped.wait(delay)
+            else:
+                deadline = time.perf_counter()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    @property
+    def paused(self):
+        return not self._resumed.is_set()
+
+    def stop(self):
+        self._stopped.set()
+        self._resumed.set()
+        self.send('wake')
+
+    def _turn(self, turn_rate):
+        self.turn_rate = turn_rate
+
+    def _set_turbo(self, steps, until=None):
+        self.turbo = max(1, steps)
+        self.until = None
+        if until is not None:
+            self.until = self._condition(until)
+
+    def _condition(self, until):
+        game = self.game
+        if until == 'level':
+            level = game.level_index
+            return lambda: game.level_index != level
+        if until == 'life':
+            lives = game.player.lives
+            return lambda: game.player.lives < lives
+        tick = int(until)
+        return lambda: self.ticks >= tick
+
+    def until_reached(self):
+        return self.until() or self.game.gameover or self.game.won
+
+    def _set_autopilot(self, enabled):
+        self.autopilot = enabled
+
+    def _set_editor(self, enabled):
+        self.editor = LevelEditor(self.game) if enabled else None
@@ -0,0 +1,180 @@
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+import numpy as np
+from core import Event
+
+
+MAGIC = b'ARKT'
+VERSION = 1
+COLUMNS = (('tick', '<u4'), ('event', 'u1'), ('level', '<u2'),
+           ('x', '<f4'), ('y', '<f4'), ('value', '<i4'))
+TYPECODES = ('I', 'B', 'H', 'f', 'f', 'i')
+CHUNK = struct.Struct('<I')
+
+_STOP = object()
+
+
+def session_path(directory='telemetry'):
+    now = time.time()
+    stem = os.path.join(directory, '%s-%03d' % (
+        time.strftime('%Y%m%d-%H%M%S', time.localtime(now)),
+        now * 1000 % 1000))
+    path = stem + '.arkt'
+    counter = 1
+    while os.path.exists(path):
+        path = '%s-%s.arkt' % (stem, counter)
+        counter += 1
+    return path
+
+
+class Telemetry:
+    def __init__(self, path, capacity=4096, compression=6):
+        self.path = path
+        self.capacity = capacity
+        self.compression = compression
+        self._spare = queue.Queue()
+        self._pending = queue.Queue()
+        self._columns = self._allocate()
+        self._count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + bytes([VERSION]))
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def record(self, tick, event, level, x, y, value):
+        columns = self._columns
+        index = self._count
+        columns[0][index] = tick
+        columns[1][index] = event
+        columns[2][index] = level
+        columns[3][index] = x
+        columns[4][index] = y
+        columns[5][index] = value
+        self._count = index + 1
+        if self._count == self.capacity:
+            self._hand_off()
+
+    def flush(self):
+        self._hand_off()
+        done = threading.Event()
+        self._pending.put(done)
+        done.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._hand_off()
+            self._pending.put(_STOP)
+            self._writer.join()
+        self._file.close()
+
+    def _allocate(self):
+        return [array(typecode, bytes(array(typecode).itemsize *
+                                      self.capacity))
+                for typecode in TYPECODES]
+
+    def _hand_off(self):
+        if not self._count:
+            return
+        self._pending.put((self._columns, self._count))
+        try:
+            self._columns = self._spare.get_nowait()
+        except queue.Empty:
+            self._columns = self._allocate()
+        self._count = 0
+
+    def _write_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is _STOP:
+                return
+            if isinstance(item, threading.Event):
+                self._file.flush()
+                item.set()
+                continue
+            columns, count = item
+            self._write_chunk(columns, count)
+            self._spare.put(columns)
+
+    def _write_chunk(self, columns, count):
+        parts = [CHUNK.pack(count)]
+        for column in columns:
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column[:count])
+                column.byteswap()
+            data = zlib.compress(memoryview(column)[:count].tobytes(),
+                                 self.compression)
+            parts.append(CHUNK.pack(len(data)))
+            parts.append(data)
+        self._file.write(b''.join(parts))
+
+
+def load(path):
+    chunks = [[] for _ in COLUMNS]
+    with open(path, 'rb') as file:
+        header = file.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC or header[len(MAGIC):] != \
+                bytes([VERSION]):
+            raise ValueError('%s is not a telemetry file' % path)
+        while True:
+            prefix = file.read(CHUNK.size)
+            if len(prefix) < CHUNK.size:
+                break
+            count, = CHUNK.unpack(prefix)
+            for (_, dtype), parts in zip(COLUMNS, chunks):
+                size, = CHUNK.unpack(file.read(CHUNK.size))
+                data = zlib.decompress(file.read(size))
+                parts.append(np.frombuffer(data, dtype, count))
+    return {name: np.concatenate(parts) if parts else np.empty(0, dtype)
+            for (name, dtype), parts in zip(COLUMNS, chunks)}
+
+
+def select(events, event, level=None):
+    mask = events['event'] == event.value
+    if level is not None:
+        mask &= events['level'] == level
+    return {name: column[mask] for name, column in events.items()}
+
+
+def heatmap(events, event, size, bins=(32, 18), level=None):
+    chosen = select(events, event, level)
+    counts, _, _ = np.histogram2d(chosen['y'], chosen['x'],
+                                  bins=(bins[1], bins[0]),
+                                  range=((0, size.height), (0, size.width)))
+    return counts
+
+
+def level_durations(events):
+    durations = {}
+    started = select(events, Event.LevelStarted)
+    completed = select(events, Event.LevelCompleted)
+    for level, tick in zip(completed['level'].tolist(),
+                           completed['tick'].tolist()):
+        starts = started['tick'][(started['level'] == level) &
+                                 (started['tick'] <= tick)]
+        if len(starts):
+            durations[level] = tick - int(starts[-1])
+    return durations
+
+
+def main(path):
+    events = load(path)
+    print('%s events, %s ticks' % (len(events['tick']),
+                                   int(events['tick'].max(initial=0))))
+    for event in Event:
+        count = int((events['event'] == event.value).sum())
+        print('%-15s %s' % (event.name, count))
+    for level, ticks in sorted(level_durations(events).items()):
+        print('level %s completed in %s ticks' % (level, ticks))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+from core import Size, BlockType
+from editor import LevelEditor, LevelWatcher
+from game import GameModel
+from level import LevelCreator
+
+
+class EditorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.original_path = LevelCreator.path
+        LevelCreator.path = self.directory
+        self.write_level('1.txt', 'CCC\nSSS')
+        self.write_level('2.txt', 'U*U')
+        self.write_level('3.txt', 'C')
+
+    def tearDown(self):
+        LevelCreator.path = self.original_path
+        shutil.rmtree(self.directory)
+
+    def write_level(self, name, content, mtime=None):
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'w') as file:
+            file.write(content)
+        if mtime is not None:
+            os.utime(filename, (mtime, mtime))
+
+    def test_levels_follow_in_lexicographical_order(self):
+        game = GameModel(Size(1000, 500))
+        self.assertEqual(len(game.blocks), 6)
+        self.assertEqual(game.level_index, 0)
+
+        game.try_get_next_level()
+        self.assertEqual({block.type for block in game.blocks},
+                         {BlockType.Unbreakable})
+
+    def test_jump_to_level(self):
+        game = GameModel(Size(1000, 500))
+
+        self.assertTrue(game.jump_to_level(3))
+        self.assertEqual(len(game.blocks), 1)
+        self.assertEqual(game.level_index, 2)
+        self.assertFalse(game.try_get_next_level())
+        self.assertTrue(game.won)
+
+        self.assertTrue(game.jump_to_level(2))
+        self.assertFalse(game.won)
+        self.assertEqual(len(game.blocks), 2)
+        self.assertFalse(game.jump_to_level(4))
+
+    def test_watcher_reports_changed_files(self):
+        watcher = LevelWatcher()
+        self.assertEqual(watcher.poll(force=True), [])
+
+        self.write_level('2.txt', 'UUU', mtime=1)
+        self.assertEqual(watcher.poll(force=True),
+                         [os.path.join(self.directory, '2.txt')])
+        self.assertEqual(watcher.poll(force=True), [])
+
+    def test_reload_keeps_unchanged_blocks(self):
+        game = GameModel(Size(1000, 500))
+        editor = LevelEditor(game)
+        strong = {block for block in game.blocks
+                  if block.type == BlockType.Strong}
+        for block in strong:
+            block.get_hit()
+
+        self.write_level('1.txt', 'C*U\nSSS', mtime=1)
+        added, removed = editor.refresh(force=True)
+
+        self.assertEqual(len(added), 1)
+        self.assertEqual(len(removed), 2)
+        self.assertEqual(len(game.blocks), 5)
+        self.assertTrue(strong <= game.blocks)
+        self.assertTrue(all(block.hits == 1 for block in strong))
+
+    def test_changes_to_other_levels_are_ignored(self):
+        game = GameModel(Size(1000, 500))
+        editor = LevelEditor(game)
+        blocks = set(game.blocks)
+
+        self.write_level('2.txt', 'UUU', mtime=1)
+        self.assertEqual(editor.refresh(force=True), (set(), set()))
+        self.assertEqual(game.blocks, blocks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import gc
+import unittest
+from core import Size
+
+try:
+    import numpy
+    from environment import ArkanoidEnv, Rasterizer
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class EnvironmentTest(unittest.TestCase):
+    def test_rasterizer_draws_scaled_rectangles(self):
+        env = ArkanoidEnv(Size(1000, 500), observation='pixels')
+        env.reset()
+        rasterizer = Rasterizer(Size(1000, 500), resolution=(100, 50))
+        buffer = rasterizer.render(env.game)
+
+        self.assertEqual(buffer.shape, (50, 100))
+        self.assertEqual(buffer.dtype, numpy.uint8)
+        self.assertTrue((buffer[48:50, 40:60] == 255).all())
+        self.assertEqual(buffer[45, 0], 0)
+        self.assertEqual(buffer[5, 2], 110)
+
+    def test_observation_shapes(self):
+        env = ArkanoidEnv(Size(1000, 500), observation='pixels',
+                          resolution=(64, 48), frame_stack=3)
+        self.assertEqual(env.reset().shape, (3, 48, 64))
+
+        env = ArkanoidEnv(Size(1000, 500), frame_stack=2)
+        observation = env.reset()
+        self.assertEqual(observation.shape, env.observation_shape)
+        self.assertEqual(observation.dtype, numpy.float32)
+
+    def test_frame_stack_shifts(self):
+        env = ArkanoidEnv(Size(1000, 500), frame_stack=2, frame_skip=1)
+        first = env.reset()
+        second, _, _, _ = env.step(ArkanoidEnv.RIGHT)
+
+        self.assertTrue((second[0] == first[1]).all())
+        self.assertGreater(second[1][0], first[1][0])
+
+    def test_frame_skip(self):
+        env = ArkanoidEnv(Size(1000, 500), frame_skip=4)
+        env.reset()
+        _, reward, done, info = env.step(ArkanoidEnv.FIRE)
+
+        self.assertEqual(info['ticks'], 4)
+        self.assertEqual(reward, 0)
+        self.assertFalse(done)
+
+    def test_seeded_runs_are_reproducible(self):
+        def play(seed):
+            env = ArkanoidEnv(Size(1000, 500), seed=seed)
+            env.reset()
+            total = 0
+            for i in range(300):
+                _, reward, done, _ = env.step(i % env.action_count)
+                total += reward
+                if done:
+                    break
+            return total, env.step(ArkanoidEnv.NOOP)[0]
+
+        score, observation = play(3)
+        other_score, other_observation = play(3)
+        self.assertEqual(score, other_score)
+        self.assertTrue((observation == other_observation).all())
+
+    def test_reset_leaves_gc_to_the_caller(self):
+        gc.unfreeze()
+        env = ArkanoidEnv(Size(1000, 500))
+        env.reset()
+        env.game.try_get_next_level()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_unknown_observation(self):
+        with self.assertRaises(ValueError):
+            ArkanoidEnv(observation='audio')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import hashlib
+import math
+import unittest
+import fixedpoint
+from core import Size, Vector
+from game import GameModel
+from level import LevelCreator
+from settings import Settings
+
+
+ROWS = ['CSCSCSCSCS', 'U*C*UU*C*U', 'SSCCSSCCSS', 'C*C*C*C*C*']
+REFERENCE_DIGEST = '1d603eb30bd6fdf8'
+
+
+def play(seed, ticks=1500, fixed_point=True):
+    size = Size(1000, 700)
+    levels = [LevelCreator.parse_rows(size, ROWS, Settings())]
+    game = GameModel(size, seed=seed, levels=levels, fixed_point=fixed_point)
+    for _ in range(ticks):
+        if game.balls:
+            game.move_ship_to(game.balls[0].x - 80)
+        game.release_ball_or_shoot()
+        game.tick()
+    return game
+
+
+def digest(game):
+    return hashlib.sha256(repr(fixedpoint.state(game)).encode()).hexdigest()
+
+
+class FixedPointTest(unittest.TestCase):
+    def test_tables(self):
+        self.assertEqual(fixedpoint.SINE[0], 0)
+        self.assertEqual(fixedpoint.SINE[300], fixedpoint.ONE // 2)
+        self.assertEqual(fixedpoint.SINE[900], fixedpoint.ONE)
+        self.assertEqual(fixedpoint.COSINE[1800], -fixedpoint.ONE)
+        for i in range(fixedpoint.ANGLES):
+            self.assertEqual(fixedpoint.SINE[i],
+                             -fixedpoint.SINE[-i % fixedpoint.ANGLES])
+            self.assertLessEqual(
+                abs(fixedpoint.SINE[i] -
+                    math.sin(2 * math.pi * i / fixedpoint.ANGLES) *
+                    fixedpoint.ONE), 1)
+
+    def test_heading_of(self):
+        self.assertEqual(fixedpoint.heading_of(Vector(0, 0)), 0)
+        self.assertEqual(fixedpoint.heading_of(Vector(-0.5, -0.5)), 2250)
+        self.assertEqual(fixedpoint.heading_of(Vector(0, -3)), 2700)
+        for heading in range(0, fixedpoint.ANGLES, 7):
+            angle = 2 * math.pi * heading / fixedpoint.ANGLES
+            vector = Vector(2 * math.cos(angle), 2 * math.sin(angle))
+            self.assertEqual(fixedpoint.heading_of(vector), heading)
+            self.assertEqual(fixedpoint.heading_of(
+                fixedpoint.unit_vector(heading)), heading)
+
+    def test_state_stays_on_fixed_grid(self):
+        game = play(2, ticks=300)
+        for entity in game.get_entities():
+            self.assertEqual(entity.x, fixedpoint.quantize(entity.x))
+            self.assertEqual(entity.y, fixedpoint.quantize(entity.y))
+
+    def test_runs_are_bit_identical(self):
+        self.assertEqual(digest(play(4)), digest(play(4)))
+        self.assertNotEqual(digest(play(4)), digest(play(5)))
+
+    def test_reference_run(self):
+        game = play(7)
+        self.assertEqual(digest(game)[:16], REFERENCE_DIGEST)
+
+    def test_float_mode_is_default(self):
+        game = GameModel(Size(1000, 500))
+        self.assertFalse(game.fixed_point)
+
+
+if __name__ == '__main__':
+    unittest.main()
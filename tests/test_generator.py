@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from core import Size, BlockType
+from game import GameModel
+from level import LevelCreator
+from settings import Settings
+
+try:
+    import numpy
+    from generator import LevelGenerator, EMPTY, UNBREAKABLE
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class GeneratorTest(unittest.TestCase):
+    def test_seeded_generation_is_reproducible(self):
+        grid = LevelGenerator(30, 40, seed=5).grid()
+        self.assertEqual(grid.shape, (30, 40))
+        self.assertTrue((grid == LevelGenerator(30, 40, seed=5).grid()).all())
+        self.assertFalse((grid == LevelGenerator(30, 40, seed=6).grid()).all())
+
+    def test_density_and_ratios(self):
+        grid = LevelGenerator(200, 200, density=0.5, strong_ratio=0,
+                              unbreakable_ratio=1, seed=0).grid()
+        self.assertAlmostEqual((grid != EMPTY).mean(), 0.5, delta=0.02)
+        self.assertTrue(((grid == EMPTY) | (grid == UNBREAKABLE)).all())
+
+    def test_symmetry(self):
+        for rows, columns in ((11, 13), (12, 12)):
+            grid = LevelGenerator(rows, columns, symmetry='both',
+                                  pockets=3, seed=1).grid()
+            self.assertEqual(grid.shape, (rows, columns))
+            self.assertTrue((grid == grid[:, ::-1]).all())
+            self.assertTrue((grid == grid[::-1]).all())
+
+    def test_pockets(self):
+        grid = LevelGenerator(3, 3, density=0, pockets=1, seed=0).grid()
+        self.assertEqual(LevelGenerator(3, 3).text(grid), 'UUU\nU*U\nU*U')
+
+    def test_written_level_matches_blocks(self):
+        generator = LevelGenerator(density=0.6, strong_ratio=0.3, seed=2)
+        grid = generator.grid()
+        filename = os.path.join(tempfile.mkdtemp(), '1.txt')
+        generator.write(filename, grid)
+
+        size = Size(1400, 800)
+        parsed = LevelCreator.parse_file(size, filename, Settings())
+        generated = generator.blocks(size, Settings(), grid)
+        self.assertEqual({(block.x, block.y, block.type) for block in parsed},
+                         {(block.x, block.y, block.type)
+                          for block in generated})
+        os.remove(filename)
+
+    def test_game_plays_generated_levels(self):
+        generator = LevelGenerator(2, 2, density=1, strong_ratio=0,
+                                   unbreakable_ratio=0, seed=0)
+        game = GameModel(Size(1000, 500),
+                         levels=generator.levels(Size(1000, 500),
+                                                 Settings(), 2))
+        self.assertEqual(len(game.blocks), 4)
+        self.assertTrue(all(block.type == BlockType.Common
+                            for block in game.blocks))
+        self.assertTrue(game.try_get_next_level())
+        self.assertFalse(game.try_get_next_level())
+
+
+if __name__ == '__main__':
+    unittest.main()
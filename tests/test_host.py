@@ -0,0 +1,165 @@
+import asyncio
+import gc
+import socket
+import unittest
+import weakref
+from core import Size
+from game import GameModel
+from host import (Host, HostClient, Session, Supervisor, encode_state,
+                  decode_state, encode_layout, decode_layout, MESSAGE, MOVE,
+                  AUTOPILOT, RELEASE, FREEZE_INTERVAL)
+
+
+class HostTest(unittest.TestCase):
+    def test_state_round_trip(self):
+        game = GameModel(Size(1000, 700), seed=1)
+        game.balls[0].twin(game)
+        data = encode_state(game, 42)
+        kind, size = MESSAGE.unpack_from(data)
+        state = decode_state(data[MESSAGE.size:])
+
+        self.assertEqual(size, len(data) - MESSAGE.size)
+        self.assertEqual(state.tick, 42)
+        self.assertEqual(state.lives, 3)
+        self.assertEqual(state.level, 1)
+        self.assertEqual((state.ship_x, state.ship_width), (400, 200))
+        self.assertEqual(len(state.balls), len(game.balls))
+        self.assertAlmostEqual(state.balls[0][0], game.balls[0].x, 3)
+
+        layout = decode_layout(encode_layout(game.blocks)[MESSAGE.size:])
+        self.assertEqual(len(layout), len(game.blocks))
+        self.assertEqual({hits for _, _, hits in layout}, {1})
+
+    def test_sessions_leave_gc_freezing_to_the_host(self):
+        gc.unfreeze()
+        try:
+            game = GameModel(Size(1000, 700), freeze_gc=False)
+            self.assertEqual(gc.get_freeze_count(), 0)
+            game.try_get_next_level()
+            self.assertEqual(gc.get_freeze_count(), 0)
+
+            host = Host()
+            host.frozen = False
+            host.step()
+            self.assertFalse(host.frozen)
+            host.frozen_at -= FREEZE_INTERVAL
+            host.step()
+            self.assertTrue(host.frozen)
+            self.assertGreater(gc.get_freeze_count(), 0)
+        finally:
+            gc.unfreeze()
+
+    def test_finished_sessions_are_collected(self):
+        try:
+            asyncio.run(self.leave())
+        finally:
+            gc.unfreeze()
+
+    async def leave(self):
+        listener = socket.create_server(('127.0.0.1', 0))
+        host = Host(interval=0.002)
+        server = asyncio.create_task(host.serve(listener))
+        try:
+            client = await HostClient.connect(
+                port=listener.getsockname()[1])
+            await asyncio.wait_for(client.state(), 5)
+            game = weakref.ref(next(iter(host.sessions)).game)
+            host.frozen_at -= FREEZE_INTERVAL
+            host.frozen = False
+            host.step()
+            self.assertTrue(host.frozen)
+
+            await client.close()
+            for _ in range(100):
+                if not host.sessions:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(host.sessions, set())
+            gc.collect()
+            self.assertIsNone(game())
+        finally:
+            server.cancel()
+            listener.close()
+
+    def test_session_sanitizes_client_input(self):
+        session = Session(Size(1000, 700), None)
+        simulation = session.simulation
+        session.control('turn', 127)
+        session.control('move_ship_to', float('nan'))
+        session.control('move_ship_to', float('inf'))
+        simulation.process_inputs()
+        self.assertEqual(simulation.turn_rate, 1)
+        self.assertEqual(session.game.ship.x, 400)
+
+        session.control('move_ship_to', 1e9)
+        simulation.process_inputs()
+        self.assertEqual(session.game.ship.x, 800)
+        session.control('move_ship_to', -50)
+        simulation.process_inputs()
+        self.assertEqual(session.game.ship.x, 0)
+        self.assertEqual(session.game.balls[0].x, (200 - 35) / 2)
+
+    def test_supervisor_adds_workers_when_saturated(self):
+        supervisor = Supervisor(port=0, workers=2)
+        supervisor.start_worker = lambda: supervisor.workers.append(None)
+        try:
+            supervisor.balance()
+            self.assertEqual(len(supervisor.workers), 1)
+            supervisor.balance()
+            self.assertEqual(len(supervisor.workers), 1)
+
+            supervisor.loads[0] = 0.9
+            supervisor.balance()
+            self.assertEqual(len(supervisor.workers), 2)
+            supervisor.loads[1] = 0.9
+            supervisor.balance()
+            self.assertEqual(len(supervisor.workers), 2)
+        finally:
+            supervisor.socket.close()
+
+    def test_sessions_over_tcp(self):
+        asyncio.run(self.play())
+
+    async def play(self):
+        listener = socket.create_server(('127.0.0.1', 0))
+        port = listener.getsockname()[1]
+        host = Host(interval=0.002)
+        server = asyncio.create_task(host.serve(listener))
+        try:
+            one = await HostClient.connect(port=port)
+            two = await HostClient.connect(port=port)
+            first = await asyncio.wait_for(one.state(), 5)
+            self.assertEqual(len(one.layout), 61)
+            self.assertEqual(first.ship_x, 400)
+
+            one.send(MOVE, 100)
+            state = await asyncio.wait_for(one.state(), 5)
+            while state.ship_x != 100:
+                state = await asyncio.wait_for(one.state(), 5)
+            self.assertEqual(state.balls[0][0], 100 + (200 - 35) / 2)
+
+            two.send(RELEASE)
+            two.send(AUTOPILOT, True)
+            ticks = [(await asyncio.wait_for(two.state(), 5)).tick
+                     for _ in range(5)]
+            self.assertEqual(ticks, sorted(ticks))
+            self.assertGreater(ticks[-1], ticks[0])
+
+            statistics = await asyncio.wait_for(one.statistics(), 5)
+            self.assertEqual(statistics.sessions, 2)
+            self.assertGreaterEqual(statistics.utilization, 0)
+
+            await one.close()
+            for _ in range(100):
+                if len(host.sessions) == 1:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(len(host.sessions), 1)
+            await two.close()
+        finally:
+            server.cancel()
+            listener.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
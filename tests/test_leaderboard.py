@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+from leaderboard import Leaderboard
+
+
+class LeaderboardTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'leaderboard.db')
+        self.leaderboard = Leaderboard(self.path, top_size=3)
+
+    def tearDown(self):
+        self.leaderboard.close()
+        shutil.rmtree(self.directory)
+
+    def test_cached_top_needs_no_flush(self):
+        for score in (100, 400, 200, 300):
+            self.leaderboard.submit('ann', score, 'levels', 1)
+        self.leaderboard.submit('bob', 1000, 'other', 2)
+
+        self.assertEqual([run.score for run in
+                          self.leaderboard.cached_top('levels')],
+                         [400, 300, 200])
+        self.assertEqual(self.leaderboard.cached_top('missing'), [])
+
+    def test_queries_after_flush(self):
+        for i in range(50):
+            self.leaderboard.submit('ann' if i % 2 else 'bob', i,
+                                    'levels' if i % 3 else 'other', 1)
+        self.leaderboard.flush()
+
+        self.assertEqual(self.leaderboard.count(), 50)
+        self.assertEqual([run.score for run in self.leaderboard.top('levels')],
+                         [49, 47, 46])
+        self.assertEqual([run.score for run in
+                          self.leaderboard.player_top('ann', limit=2)],
+                         [49, 47])
+        self.assertEqual([run.score for run in
+                          self.leaderboard.player_top('bob', 'other')],
+                         [48, 42, 36])
+
+    def test_cache_is_loaded_from_disk(self):
+        for score in (10, 30, 20, 40):
+            self.leaderboard.submit('ann', score, 'levels', 1)
+        self.leaderboard.close()
+
+        self.leaderboard = Leaderboard(self.path, top_size=2)
+        self.assertTrue(self.leaderboard.loaded.wait(5))
+        self.assertEqual([run.score for run in
+                          self.leaderboard.cached_top('levels')], [40, 30])
+
+    def test_database_uses_wal(self):
+        self.leaderboard.flush()
+        mode = self.leaderboard._connection().execute(
+            'PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+
+if __name__ == '__main__':
+    unittest.main()
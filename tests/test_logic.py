@@ -1,10 +1,17 @@
+import gc
+import random
 import unittest
 from math import pi
 import bonuses
 from settings import Settings
 from core import Frame, Size, BallState, BlockType, Vector, compare, sign
 from game import GameModel
-from entities import Ball, Ship, Block
+from entities import Ball, Ship, Block, Bullet
+from broadphase import SweepAndPrune
+from gcstats import GCMonitor
+from pool import Pool
+from colliders import LevelColliders
+from level import LevelCreator
 
 
 class LogicTest(unittest.TestCase):
@@ -167,6 +174,188 @@ class LogicTest(unittest.TestCase):
         self.assertEqual(game.balls[0].direction.x, -1)
         self.assertEqual(game.balls[0].direction.y, 0)
 
+    def test_pool_reuses_instances(self):
+        pool = Pool()
+        bullet = pool.acquire(Bullet, 10, 20, Settings())
+        bullet.move()
+        pool.release(bullet)
+        self.assertEqual(pool.free_count(Bullet), 1)
+
+        reused = pool.acquire(Bullet, 30, 40, Settings())
+        self.assertIs(reused, bullet)
+        self.assertEqual(tuple(reused.location), (30, 40))
+        self.assertEqual(reused.velocity, Settings.bullet_velocity)
+        self.assertEqual(pool.free_count(Bullet), 0)
+
+    def test_pool_resets_ball_state(self):
+        pool = Pool()
+        ball = pool.acquire(Ball, 0, 0, Settings())
+        ball.change_state(BallState.Fiery)
+        ball.accelerate()
+        pool.release(ball)
+
+        ball = pool.acquire(Ball, 5, 5, Settings())
+        self.assertEqual(ball.state, BallState.Free)
+        self.assertEqual(ball.velocity, Settings.ball_velocity)
+
+    def test_bullets_return_to_pool(self):
+        game = GameModel(Size(1000, 500))
+        game.ship.get_ammo(2)
+        game.shooting()
+        for _ in range(50):
+            game.tick()
+
+        self.assertEqual(len(game.bullets), 0)
+        self.assertEqual(game.pool.free_count(Bullet), 2)
+
+    def test_gc_monitor_records_pauses(self):
+        game = GameModel(Size(1000, 500))
+        game.tick()
+        monitor = GCMonitor(game)
+        monitor.install()
+        try:
+            gc.collect()
+        finally:
+            monitor.uninstall()
+
+        self.assertEqual(monitor.longest.tick, 1)
+        self.assertEqual(monitor.longest.generation, 2)
+        self.assertIn('tick 1', monitor.report())
+
+    def test_ball_collision(self):
+        one = Ball(100, 100, Settings())
+        other = Ball(130, 100, Settings())
+        one.direction = Vector(1, 0)
+        other.direction = Vector(-1, 0)
+
+        self.assertTrue(one.collide_with(other))
+        self.assertEqual((one.direction.x, one.direction.y), (-1, 0))
+        self.assertEqual((other.direction.x, other.direction.y), (1, 0))
+        self.assertEqual(other.x - one.x, 35)
+        self.assertFalse(one.collide_with(other))
+
+    def test_separating_balls_do_not_collide(self):
+        one = Ball(100, 100, Settings())
+        other = Ball(120, 100, Settings())
+        one.direction = Vector(-1, 0)
+        other.direction = Vector(1, 0)
+
+        self.assertFalse(one.collide_with(other))
+        self.assertEqual(one.direction.x, -1)
+
+    def test_caught_ball_does_not_collide(self):
+        game = GameModel(Size(1000, 500))
+        ball = Ball(*game.balls[0].location, Settings())
+        ball.direction = Vector(0, 1)
+        game.balls.append(ball)
+        game.collide_balls()
+
+        self.assertEqual(ball.direction.y, 1)
+        self.assertEqual(game.balls[0].state, BallState.Caught)
+
+    def test_broadphase_matches_pairwise_check(self):
+        rng = random.Random(1)
+        balls = [Ball(rng.uniform(0, 500), rng.uniform(0, 500), Settings())
+                 for _ in range(60)]
+        broadphase = SweepAndPrune()
+
+        for _ in range(3):
+            broadphase.update(balls)
+            found = {frozenset(pair) for pair in broadphase.pairs()}
+            expected = {frozenset((one, other))
+                        for i, one in enumerate(balls)
+                        for other in balls[i + 1:]
+                        if one.intersects_with(other)}
+            self.assertEqual(found, expected)
+            self.assertEqual([ball.x for ball in broadphase.entities],
+                             sorted(ball.x for ball in balls))
+
+            for ball in balls:
+                ball.relocate(rng.uniform(-50, 50), 0)
+            balls = balls[5:] + [Ball(0, 0, Settings())]
+
+    def test_unbreakable_blocks_merge_into_walls(self):
+        size = Size(1000, 700)
+        blocks = LevelCreator.parse_file(size, 'levels/3.txt', Settings())
+        colliders = LevelColliders(blocks)
+
+        walls = sorted((wall.frame.x, wall.frame.y, wall.frame.width,
+                        wall.frame.height) for wall in colliders.walls)
+        self.assertEqual(walls, [(0, 50, 100, 60), (0, 320, 100, 30),
+                                 (300, 170, 400, 30), (400, 200, 200, 30),
+                                 (900, 50, 100, 60), (900, 320, 100, 30)])
+        self.assertEqual(sum(len(wall.tiles) for wall in colliders.walls),
+                         len([block for block in blocks
+                              if block.type == BlockType.Unbreakable]))
+
+    def test_colliders_match_pairwise_check(self):
+        size = Size(1000, 700)
+        rng = random.Random(5)
+        for filename in LevelCreator.get_level_files():
+            blocks = LevelCreator.parse_file(size, filename, Settings())
+            colliders = LevelColliders(blocks)
+            for _ in range(200):
+                ball = Ball(rng.uniform(-50, 1000), rng.uniform(0, 450),
+                            Settings())
+                hits = set()
+                colliders.collect(ball, hits)
+                self.assertEqual(hits, {block for block in blocks
+                                        if block.intersects_with(ball)})
+
+    def test_row_spans_split_on_destruction(self):
+        game = GameModel(Size(1000, 700), levels=[
+            LevelCreator.parse_rows(Size(1000, 700), ['CCC'], Settings())])
+        left, middle, right = sorted(game.blocks, key=lambda block: block.x)
+        self.assertEqual(game.colliders.surface(left).width, 300)
+
+        game.remove_blocks({middle})
+        self.assertTrue(game.colliders.is_current(game.blocks))
+        self.assertEqual(game.colliders.surface(left).width, 100)
+        self.assertEqual(game.colliders.surface(right).x, right.x)
+        hits = set()
+        game.colliders.collect(middle, hits)
+        self.assertEqual(hits, {left, right})
+
+    def test_no_side_reflection_at_block_seam(self):
+        settings = Settings()
+        game = GameModel(Size(1000, 700), levels=[{
+            Block(300, 300, BlockType.Strong, settings),
+            Block(400, 300, BlockType.Strong, settings)}])
+        ball = game.balls[0]
+        ball.direction = Vector(-0.6, -0.8)
+        ball.location = (380.5, 329)
+        hits = set()
+        game.colliders.collect(ball, hits)
+        self.assertEqual(len(hits), 2)
+
+        ball.smash_blocks(game, hits)
+        self.assertEqual(ball.direction.x, -0.6)
+        self.assertEqual(ball.direction.y, 0.8)
+
+    def test_layout_version_follows_block_changes(self):
+        game = GameModel(Size(1000, 700))
+        version = game.layout_version
+        for _ in range(50):
+            game.tick()
+        self.assertEqual(game.layout_version, version)
+
+        block = next(iter(game.blocks))
+        game.hit_block(block)
+        self.assertEqual(game.layout_version, version + 1)
+        game.try_get_next_level()
+        self.assertEqual(game.layout_version, version + 2)
+
+    def test_game_starts_at_selected_level(self):
+        size = Size(1000, 700)
+        game = GameModel(size, start=2)
+        files = LevelCreator.get_level_files()
+        expected = LevelCreator.parse_file(size, files[2], Settings())
+
+        self.assertEqual(game.level_index, 2)
+        self.assertEqual(game.current_level, 4)
+        self.assertEqual(sorted((block.x, block.y) for block in game.blocks),
+                         sorted((block.x, block.y) for block in expected))
+
 
 if __name__ == '__main__':
     unittest.main()
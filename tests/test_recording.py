@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from core import Size
+from game import GameModel
+from recording import (Run, new_run, save_run, load_run, replay, export,
+                       frame_ranges, RAW_FILENAME)
+from simulation import Simulation
+
+
+def record(ticks=120):
+    run = new_run(Size(1000, 700), seed=3)
+    game = GameModel(Size(*run.playfield), seed=run.seed)
+    simulation = Simulation(game)
+    simulation.journal = run.inputs
+    for tick in range(ticks):
+        if tick == 10:
+            simulation.send('release_ball')
+        if tick % 7 == 0:
+            simulation.send('move_ship_to', tick * 3.5)
+        simulation.step()
+    return run._replace(ticks=simulation.ticks), game
+
+
+def normalized(snapshot):
+    return snapshot._replace(sprites=sorted(snapshot.sprites))
+
+
+class RecordingTest(unittest.TestCase):
+    def test_replay_matches_recorded_game(self):
+        run, game = record()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.json')
+            save_run(path, run)
+            loaded = load_run(path)
+
+        snapshots = list(replay(loaded))
+        self.assertEqual(len(snapshots), run.ticks + 1)
+        self.assertEqual([snapshot.tick for snapshot in snapshots],
+                         list(range(run.ticks + 1)))
+        last = snapshots[-1]
+        self.assertEqual(last.sprites[0].x, game.ship.x)
+        self.assertEqual(sorted((sprite.x, sprite.y)
+                                for sprite in last.sprites),
+                         sorted((entity.x, entity.y)
+                                for entity in game.get_entities()))
+
+    def test_replay_fast_forwards_to_range(self):
+        run, _ = record()
+        full = list(replay(run))
+        part = list(replay(run, 50, 60))
+        self.assertEqual([normalized(snapshot) for snapshot in part],
+                         [normalized(snapshot) for snapshot in full[50:60]])
+
+    def test_frame_ranges(self):
+        self.assertEqual(frame_ranges(0, 10, 3), [(0, 3), (3, 7), (7, 10)])
+        self.assertEqual(frame_ranges(5, 7, 4), [(5, 6), (6, 7)])
+
+    def test_export_png_and_raw(self):
+        run, _ = record(ticks=20)
+        with tempfile.TemporaryDirectory() as directory:
+            frames = export(run, directory, workers=1, start=18, scale=0.1)
+            self.assertEqual(frames, 3)
+            self.assertEqual(sorted(os.listdir(directory)),
+                             ['frame_000018.png', 'frame_000019.png',
+                              'frame_000020.png'])
+
+            serial = os.path.join(directory, 'serial')
+            parallel = os.path.join(directory, 'parallel')
+            export(run, serial, 'rgb', workers=1, scale=0.1)
+            export(run, parallel, 'rgb', workers=2, scale=0.1)
+            with open(os.path.join(serial, RAW_FILENAME), 'rb') as file:
+                expected = file.read()
+            with open(os.path.join(parallel, RAW_FILENAME), 'rb') as file:
+                self.assertEqual(file.read(), expected)
+            self.assertEqual(len(expected), 21 * 100 * 70 * 3)
+
+    def test_unknown_format(self):
+        run = Run(0, False, (1000, 700), 0, [])
+        with self.assertRaises(ValueError):
+            export(run, tempfile.gettempdir(), 'gif')
+
+
+if __name__ == '__main__':
+    unittest.main()
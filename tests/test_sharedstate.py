@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+import unittest
+from core import Size, BallState, BlockType
+from editor import LevelEditor
+from entities import Block
+from game import GameModel
+
+try:
+    import numpy
+    from sharedstate import StatePublisher, StateReader
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class SharedStateTest(unittest.TestCase):
+    def setUp(self):
+        self.name = 'arkanoid-test-%s' % os.getpid()
+        self.publisher = StatePublisher(self.name, max_balls=4, grid_rows=16,
+                                        grid_columns=16)
+        self.reader = StateReader(self.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.publisher.close()
+
+    def test_reader_sees_published_state(self):
+        game = GameModel(Size(1000, 500))
+        block = next(iter(game.blocks))
+        block.type = BlockType.Strong
+        block.get_hit()
+        self.publisher.publish(game, 5)
+        state = self.reader.read()
+
+        self.assertEqual(state.sequence, 2)
+        self.assertEqual(state.tick, 5)
+        self.assertEqual(state.lives, 3)
+        self.assertEqual(state.level, 1)
+        self.assertEqual(tuple(state.ship), (400, 475, 200, 25))
+        self.assertEqual(len(state.balls), 1)
+        self.assertEqual(state.balls[0][4], BallState.Caught.value)
+        self.assertEqual(int((state.grid != 0).sum()), len(game.blocks))
+
+        row = round((block.y - state.grid_origin[1]) / state.cell_size[1])
+        column = round((block.x - state.grid_origin[0]) / state.cell_size[0])
+        self.assertEqual(state.grid[row, column], 2)
+
+    def test_grid_follows_edited_layout(self):
+        game = GameModel(Size(1000, 500))
+        self.publisher.publish(game, 1)
+        brick = game.settings.brick_size
+        left = min(block.x for block in game.blocks) - brick.width
+        top = min(block.y for block in game.blocks) - brick.height
+        blocks = {Block(block.x, block.y, block.type, game.settings)
+                  for block in game.blocks}
+        blocks.add(Block(left, top, BlockType.Common, game.settings))
+        LevelEditor(game).apply_layout(blocks)
+        self.publisher.publish(game, 2)
+        state = self.reader.read()
+
+        self.assertEqual(tuple(state.grid_origin), (left, top))
+        self.assertEqual(int((state.grid != 0).sum()), len(game.blocks))
+        self.assertEqual(state.grid[0, 0], 1)
+
+    def test_capacities_are_respected(self):
+        game = GameModel(Size(1000, 500))
+        for _ in range(3):
+            game.balls[0].twin(game)
+        self.publisher.publish(game, 1)
+
+        self.assertEqual(len(self.reader.read().balls), 4)
+
+    def test_reader_never_returns_torn_state(self):
+        game = GameModel(Size(1000, 500))
+        game.release_ball()
+        stop = threading.Event()
+
+        def write():
+            tick = 0
+            while not stop.is_set():
+                tick += 1
+                game.player.score = tick
+                self.publisher.publish(game, tick)
+                time.sleep(0)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(200):
+                state = self.reader.read()
+                self.assertEqual(state.score, state.tick)
+                self.assertEqual(state.sequence % 2, 0)
+        finally:
+            stop.set()
+            writer.join()
+
+    def test_rejects_foreign_segment(self):
+        from multiprocessing import shared_memory
+        memory = shared_memory.SharedMemory(self.name + '-foreign',
+                                            create=True, size=256)
+        try:
+            with self.assertRaises(ValueError):
+                StateReader(self.name + '-foreign', track=True)
+        finally:
+            memory.close()
+            memory.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
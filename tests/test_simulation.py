@@ -0,0 +1,165 @@
+import time
+import unittest
+from core import Size, BallState
+from game import GameModel
+from simulation import Simulation, Snapshot, TripleBuffer
+
+
+class SimulationTest(unittest.TestCase):
+    def test_triple_buffer_returns_latest(self):
+        buffer = TripleBuffer(0)
+        self.assertEqual(buffer.read(), 0)
+
+        buffer.publish(1)
+        buffer.publish(2)
+        self.assertEqual(buffer.read(), 2)
+        self.assertEqual(buffer.read(), 2)
+
+        buffer.publish(3)
+        self.assertEqual(buffer.read(), 3)
+
+    def test_snapshot_capture(self):
+        game = GameModel(Size(1000, 500))
+        snapshot = Snapshot.capture(game, 7)
+
+        self.assertEqual(snapshot.tick, 7)
+        self.assertEqual(snapshot.lives, 3)
+        self.assertEqual(len(snapshot.sprites),
+                         len(list(game.get_entities())))
+        self.assertEqual(snapshot.sprites[0].x, game.ship.x)
+
+    def test_inputs_applied_on_step(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game)
+        simulation.send('move_ship_to', 100)
+        self.assertEqual(game.ship.x, 400)
+
+        simulation.step()
+        self.assertEqual(game.ship.x, 100)
+        self.assertEqual(game.balls[0].state, BallState.Caught)
+        self.assertEqual(simulation.snapshots.read().tick, 1)
+
+        simulation.send('release_ball')
+        simulation.send('set_ball_velocity', 20)
+        simulation.step()
+        self.assertEqual(game.balls[0].state, BallState.Free)
+        self.assertEqual(game.balls[0].velocity, 20)
+
+    def test_turn_rate(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game)
+        simulation.send('turn', 1)
+        simulation.step()
+
+        self.assertEqual(game.ship.x, 400 + game.settings.ship_velocity)
+
+    def test_thread_publishes_snapshots(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game, interval=0.001, idle_sleep=False)
+        simulation.start()
+        try:
+            for _ in range(1000):
+                if simulation.snapshots.read().tick >= 5:
+                    break
+                simulation.join(0.005)
+            self.assertGreaterEqual(simulation.snapshots.read().tick, 5)
+        finally:
+            simulation.stop()
+            simulation.join(1)
+        self.assertFalse(simulation.is_alive())
+
+    def test_quiescent_states(self):
+        game = GameModel(Size(1000, 500))
+        self.assertTrue(game.is_quiescent())
+        self.assertFalse(game.is_quiescent(turn_rate=1))
+
+        game.ship.get_ammo(2)
+        game.shooting()
+        self.assertFalse(game.is_quiescent())
+
+        game.reset()
+        game.release_ball()
+        self.assertFalse(game.is_quiescent())
+
+        for _ in range(game.player.lives):
+            game.kill_player()
+        self.assertTrue(game.is_quiescent(turn_rate=1))
+
+    def test_idle_simulation_sleeps_until_input(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game, interval=0.001)
+        simulation.start()
+        try:
+            self.assertTrue(simulation.idle.wait(1))
+            ticks = simulation.ticks
+            time.sleep(0.05)
+            self.assertEqual(simulation.ticks, ticks)
+
+            simulation.send('move_ship_to', 100)
+            for _ in range(100):
+                if simulation.snapshots.read().tick > ticks:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(simulation.snapshots.read().sprites[0].x, 100)
+            self.assertGreater(simulation.ticks, ticks)
+            self.assertTrue(simulation.idle.wait(1))
+            self.assertEqual(simulation.handled, simulation.sent)
+
+            simulation.send('release_ball')
+            time.sleep(0.05)
+            self.assertGreater(simulation.ticks, ticks + 5)
+        finally:
+            simulation.stop()
+            simulation.join(1)
+        self.assertFalse(simulation.is_alive())
+
+    def test_turbo_runs_several_ticks_per_step(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game)
+        simulation.send('set_turbo', 5)
+        simulation.step()
+        self.assertEqual(simulation.ticks, 5)
+        self.assertEqual(simulation.snapshots.read().tick, 5)
+
+    def test_turbo_skips_snapshots_until_condition(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game)
+        simulation.send('set_turbo', 4, 10)
+        simulation.step()
+        simulation.step()
+        self.assertEqual(simulation.ticks, 8)
+        self.assertEqual(simulation.snapshots.read().tick, 0)
+
+        simulation.step()
+        self.assertEqual(simulation.ticks, 10)
+        self.assertEqual(simulation.snapshots.read().tick, 10)
+        self.assertEqual(simulation.turbo, 1)
+        self.assertIsNone(simulation.until)
+
+    def test_turbo_until_life_lost(self):
+        game = GameModel(Size(1000, 500))
+        simulation = Simulation(game)
+        simulation.send('release_ball')
+        simulation.send('set_turbo', 50, 'life')
+        for _ in range(100):
+            simulation.step()
+            if simulation.until is None:
+                break
+        self.assertEqual(simulation.snapshots.read().lives, 2)
+        self.assertEqual(simulation.snapshots.read().tick, simulation.ticks)
+
+    def test_autopilot_keeps_ball_in_play(self):
+        game = GameModel(Size(1000, 700), seed=1)
+        simulation = Simulation(game)
+        simulation.send('set_autopilot', True)
+        self.assertFalse(simulation.quiescent)
+        simulation.send('set_turbo', 100)
+        for _ in range(20):
+            simulation.step()
+        self.assertEqual(game.balls[0].state, BallState.Free)
+        self.assertEqual(game.player.lives, 3)
+        self.assertLess(len(game.blocks), 61)
+
+
+if __name__ == '__main__':
+    unittest.main()
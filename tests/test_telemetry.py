@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from bonuses import BONUSES, LifeBonus
+from core import Size, Event
+from game import GameModel
+from level import LevelCreator
+from settings import Settings
+from telemetry import (Telemetry, load, select, heatmap, level_durations,
+                       session_path)
+
+
+class TelemetryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.arkt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_chunks_round_trip(self):
+        telemetry = Telemetry(self.path, capacity=16)
+        for tick in range(100):
+            telemetry.record(tick, Event.BlockHit.value, 2, tick * 1.5,
+                             tick / 2, tick - 50)
+        telemetry.close()
+
+        events = load(self.path)
+        np.testing.assert_array_equal(events['tick'], np.arange(100))
+        np.testing.assert_array_equal(events['x'],
+                                      np.arange(100, dtype=np.float32) * 1.5)
+        np.testing.assert_array_equal(events['value'], np.arange(-50, 50))
+        self.assertTrue((events['level'] == 2).all())
+
+    def test_quick_restarts_get_separate_sessions(self):
+        paths = []
+        for _ in range(3):
+            paths.append(session_path(self.directory.name))
+            Telemetry(paths[-1]).close()
+        self.assertEqual(len(set(paths)), 3)
+
+    def test_flush_writes_partial_buffer(self):
+        telemetry = Telemetry(self.path, capacity=1024)
+        telemetry.record(1, Event.BallLost.value, 1, 10, 20, 0)
+        telemetry.flush()
+        self.assertEqual(len(load(self.path)['tick']), 1)
+        telemetry.close()
+
+    def test_game_events(self):
+        size = Size(1000, 700)
+        settings = Settings()
+        levels = [LevelCreator.parse_rows(size, ['CCCC'], settings),
+                  LevelCreator.parse_rows(size, ['C'], settings)]
+        telemetry = Telemetry(self.path)
+        game = GameModel(size, seed=1, levels=levels, telemetry=telemetry)
+        game.bonuses.add(LifeBonus(game.ship.x, game.ship.y - 30, settings))
+        for _ in range(3000):
+            if game.level_index == 1:
+                break
+            game.autopilot()
+            game.tick()
+        telemetry.close()
+
+        events = load(self.path)
+        started = select(events, Event.LevelStarted)
+        self.assertEqual(started['level'].tolist(), [1, 2])
+        self.assertEqual(started['value'].tolist(), [4, 1])
+        self.assertEqual(len(select(events, Event.BlockDestroyed, 1)['x']), 4)
+        caught = select(events, Event.BonusCaught)
+        self.assertIn(BONUSES.index(LifeBonus), caught['value'].tolist())
+
+        durations = level_durations(events)
+        self.assertEqual(list(durations), [1])
+        self.assertGreater(durations[1], 0)
+
+        counts = heatmap(events, Event.BlockHit, size, bins=(10, 7))
+        self.assertEqual(counts.shape, (7, 10))
+        self.assertEqual(counts.sum(),
+                         len(select(events, Event.BlockHit)['x']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from level import LevelCreator
+from thumbnails import ThumbnailCache, level_hash
+
+
+class ThumbnailCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.level = os.path.join(self.directory, '1.txt')
+        shutil.copy(LevelCreator.get_level_files()[2], self.level)
+        self.cache = ThumbnailCache(os.path.join(self.directory, 'cache'),
+                                    workers=1)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def wait_for_thumbnail(self):
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            ready = self.cache.poll()
+            if ready:
+                return ready
+            time.sleep(0.05)
+        self.fail('thumbnail was not rendered')
+
+    def test_renders_once_and_reuses_cache(self):
+        self.assertEqual(self.cache.request([self.level]),
+                         [(self.level, None)])
+        self.assertEqual(self.cache.request([self.level]),
+                         [(self.level, None)])
+        (filename, target), = self.wait_for_thumbnail()
+        self.assertEqual(filename, self.level)
+        self.assertTrue(os.path.exists(target))
+        self.assertIn(level_hash(self.level), target)
+
+        from PyQt5.QtGui import QImage
+        image = QImage(target)
+        self.assertEqual((image.width(), image.height()), self.cache.size)
+        self.assertEqual(self.cache.request([self.level]),
+                         [(self.level, target)])
+        self.assertEqual(self.cache.poll(), [])
+
+    def test_identical_levels_share_thumbnail(self):
+        copy = os.path.join(self.directory, '2.txt')
+        shutil.copy(self.level, copy)
+        self.cache.request([self.level, copy])
+        ready = self.wait_for_thumbnail()
+        self.assertEqual([filename for filename, _ in ready],
+                         [self.level, copy])
+        self.assertEqual(ready[0][1], ready[1][1])
+
+    def test_failed_render_is_reported(self):
+        self.cache.request([self.level])
+        os.remove(self.level)
+        self.assertEqual(self.wait_for_thumbnail(), [(self.level, None)])
+        self.assertEqual(self.cache.poll(), [])
+
+    def test_changed_level_gets_new_thumbnail(self):
+        before = self.cache.target(self.level)
+        with open(self.level, 'a') as file:
+            file.write('\nUUUU')
+        self.assertNotEqual(self.cache.target(self.level), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import functools
+import hashlib
+import multiprocessing
+import os
+import queue
+from level import LevelCreator
+from settings import Settings
+from simulation import Sprite
+
+
+SIZE = (192, 108)
+BACKGROUND = 0xff000018
+
+
+def level_hash(filename):
+    with open(filename, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def render_thumbnail(job):
+    filename, target, size = job
+    from PyQt5.QtGui import QImage, QPainter
+    from renderer import FrameRenderer, offscreen_application
+    offscreen_application()
+
+    playfield = Settings.playfield_size
+    blocks = LevelCreator.parse_file(playfield, filename, Settings())
+    image = QImage(*size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(BACKGROUND)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    painter.scale(size[0] / playfield.width, size[1] / playfield.height)
+    FrameRenderer(playfield).draw_sprites(painter, (
+        Sprite(block.x, block.y, block.width, block.height,
+               block.get_image()) for block in blocks))
+    painter.end()
+
+    temporary = '%s.%s.tmp' % (target, os.getpid())
+    image.save(temporary, 'PNG')
+    os.replace(temporary, target)
+    return filename, target
+
+
+class ThumbnailCache:
+    path = os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                        '.thumbnails')
+
+    def __init__(self, path=None, size=SIZE, workers=None):
+        self.path = path or ThumbnailCache.path
+        self.size = size
+        self.workers = workers
+        self._pool = None
+        self._requested = {}
+        self._ready = queue.Queue()
+
+    def target(self, filename):
+        return os.path.join(self.path, '%s-%sx%s.png' % (
+            level_hash(filename), *self.size))
+
+    def request(self, filenames):
+        thumbnails = []
+        missing = []
+        for filename in filenames:
+            target = self.target(filename)
+            if os.path.exists(target):
+                thumbnails.append((filename, target))
+                continue
+            thumbnails.append((filename, None))
+            waiting = self._requested.setdefault(target, set())
+            if not waiting:
+                missing.append((filename, target, self.size))
+            waiting.add(filename)
+        if missing:
+            os.makedirs(self.path, exist_ok=True)
+            pool = self._get_pool()
+            for job in missing:
+                pool.apply_async(
+                    render_thumbnail, (job,), callback=self._rendered,
+                    error_callback=functools.partial(self._failed, job[1]))
+        return thumbnails
+
+    def _rendered(self, result):
+        self._ready.put((result[1], True))
+
+    def _failed(self, target, error):
+        self._ready.put((target, False))
+
+    def poll(self):
+        ready = []
+        while True:
+            try:
+                target, rendered = self._ready.get_nowait()
+            except queue.Empty:
+                return ready
+            for filename in sorted(self._requested.pop(target, ())):
+                ready.append((filename, target if rendered else None))
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.get_context('spawn').Pool(
+                self.workers or os.cpu_count() or 1)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None